@@ -0,0 +1,5 @@
+from advent.runner import main
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""
+Batch solving of many (day, part, input file) jobs, spread over a pool of worker processes.
+
+Jobs are handed to the workers in chunks, to keep the overhead of inter-process communication low when there are
+many small inputs, and results come back in the order of the jobs. An exception raised while solving one job is
+recorded in its result, without affecting any other job.
+"""
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, Union
+from advent.registry import get_solution
+
+
+class Job(NamedTuple):
+    day: int
+    part: int
+    file_path: Union[str, Path]
+
+
+class JobResult(NamedTuple):
+    job: Job
+    answer: Any = None
+    error: Optional[str] = None
+    duration_ns: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def solve_job(job: Job) -> JobResult:
+    """
+    Solve a single job, capturing any exception raised by the solver.
+
+    :param job: the job to solve
+    :return: JobResult with either the answer or a description of the error
+    """
+    start = perf_counter_ns()
+    try:
+        answer = get_solution(job.day, job.part).solver(job.file_path)
+    except Exception as exception:
+        error = "".join(traceback.format_exception_only(type(exception), exception)).strip()
+        return JobResult(job, error=error, duration_ns=perf_counter_ns() - start)
+    return JobResult(job, answer=answer, duration_ns=perf_counter_ns() - start)
+
+
+def default_chunksize(job_count: int, max_workers: int) -> int:
+    """
+    Chunk size giving each worker about four chunks, so that workers finishing early can pick up remaining work.
+    """
+    return max(1, job_count // (max_workers * 4))
+
+
+def iter_batch(
+        jobs: Iterable[Job],
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None
+) -> Iterator[JobResult]:
+    """
+    Solve jobs in a pool of worker processes, yielding results in the order of the jobs.
+
+    :param jobs: jobs to solve
+    :param max_workers: number of worker processes, defaults to the number of CPUs
+    :param chunksize: number of jobs sent to a worker at once, by default chosen based on the number of jobs
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = chunksize or default_chunksize(len(jobs), max_workers)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(solve_job, jobs, chunksize=chunksize)
+
+
+def solve_batch(
+        jobs: Iterable[Job],
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None
+) -> list[JobResult]:
+    """
+    Solve jobs in a pool of worker processes.
+
+    :param jobs: jobs to solve
+    :param max_workers: number of worker processes, defaults to the number of CPUs
+    :param chunksize: number of jobs sent to a worker at once, by default chosen based on the number of jobs
+    :return: list of JobResults, in the order of the jobs
+    """
+    return list(iter_batch(jobs, max_workers, chunksize))
@@ -0,0 +1,299 @@
+"""
+Benchmark suite for all solutions and their alternative implementations, usable as 'python -m advent.benchmark'.
+
+Every implementation is run on inputs of each requested size: after a number of untimed warmup runs, the given number
+of timed trials is made, and the median and 95th percentile are reported. Results can be written to a JSON file and
+later used as a baseline, against which a new run is compared to flag regressions.
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, NamedTuple, Optional, Union
+from advent import mapreduce
+from advent.generators import generate_input
+from advent.registry import get_alternative_solvers
+from advent.runner import Solver, find_solutions
+
+
+# implementations of each (day, part) besides the one the runner uses, keyed by a descriptive name - those declared
+# by the solution modules in ALTERNATIVE_PARTS, and the map-reduce engine for the days it covers
+ALTERNATIVES: dict[tuple[int, int], dict[str, Solver]] = get_alternative_solvers()
+for day, part in mapreduce.TASKS:
+    if part == mapreduce.ALL_PARTS:
+        continue
+    ALTERNATIVES.setdefault((day, part), {})["map-reduce"] = partial(mapreduce.solve, day, part)
+
+# days whose puzzle input stays valid when repeated several times, mapped to the separator between the copies
+REPLICABLE_DAYS: dict[int, str] = {
+    1: "\n",
+    2: "",
+    3: "",
+    4: "",
+    9: ""
+}
+
+DEFAULT_SIZES = [1]
+DEFAULT_REPEATS = 5
+DEFAULT_WARMUP = 1
+DEFAULT_THRESHOLD = 0.1
+
+# given a day, an input size and a directory to write to, return the path to an input file of that size
+InputProvider = Callable[[int, int, Path], Optional[Path]]
+
+
+class BenchmarkResult(NamedTuple):
+    day: int
+    part: int
+    implementation: str
+    size: int
+    median_ns: float
+    p95_ns: float
+    min_ns: int
+    repeats: int
+
+
+class Regression(NamedTuple):
+    result: BenchmarkResult
+    baseline_median_ns: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.result.median_ns / self.baseline_median_ns
+
+
+def implementations() -> dict[tuple[int, int], dict[str, Solver]]:
+    """
+    Collect every implementation of every (day, part): the runner's solver under the name 'default', followed by
+    the alternatives.
+    """
+    collected: dict[tuple[int, int], dict[str, Solver]] = {}
+    for key, solution in sorted(find_solutions().items()):
+        collected[key] = {"default": solution.solver, **ALTERNATIVES.get(key, {})}
+    return collected
+
+
+def replicated_input(day: int, size: int, directory: Path) -> Optional[Path]:
+    """
+    Input provider which creates an input of the given size by repeating the day's puzzle input size times.
+
+    :param day: day to create input for
+    :param size: number of copies of the puzzle input
+    :param directory: directory to write the input file to
+    :return: path to the input file, or None if the day's input cannot be repeated and size is not 1
+    """
+    puzzle_input = find_solutions()[(day, 1)].default_input
+    if size == 1:
+        return puzzle_input
+    if day not in REPLICABLE_DAYS:
+        return None
+    contents = puzzle_input.read_text()
+    if not contents.endswith("\n"):
+        contents += "\n"
+    file_path = Path(directory, f"{day}_{size}.txt")
+    file_path.write_text(REPLICABLE_DAYS[day].join([contents] * size))
+    return file_path
+
+
+def generated_input(day: int, size: int, directory: Path) -> Path:
+    """
+    Input provider which creates a synthetic input of the given size, see advent.generators for what size means
+    for each day.
+
+    :param day: day to create input for
+    :param size: size passed on to the day's generator
+    :param directory: directory to write the input file to
+    :return: path to the input file
+    """
+    return generate_input(day, size, Path(directory, f"{day}_{size}.txt"))
+
+
+def time_solver(solver: Solver, file_path: Union[str, Path], repeats: int, warmup: int) -> list[int]:
+    """
+    Time repeated runs of a solver on an input file, with the garbage collector disabled during each run.
+
+    :param solver: solver to time
+    :param file_path: path to input file
+    :param repeats: number of timed runs
+    :param warmup: number of untimed runs done first
+    :return: duration of each timed run, in nanoseconds
+    """
+    for _ in range(warmup):
+        solver(file_path)
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeats):
+            gc.disable()
+            start = perf_counter_ns()
+            solver(file_path)
+            end = perf_counter_ns()
+            if gc_was_enabled:
+                gc.enable()
+            timings.append(end - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return timings
+
+
+def percentile(values: list[int], fraction: float) -> int:
+    """
+    Nearest-rank percentile of values, for example fraction=0.95 for the 95th percentile.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def run_benchmarks(
+        days: Optional[list[int]] = None,
+        sizes: Optional[list[int]] = None,
+        repeats: int = DEFAULT_REPEATS,
+        warmup: int = DEFAULT_WARMUP,
+        input_provider: InputProvider = replicated_input,
+        progress: Optional[Callable[[BenchmarkResult], None]] = None
+) -> list[BenchmarkResult]:
+    """
+    Benchmark every implementation of the selected days on inputs of every given size.
+
+    :param days: days to benchmark, all of them if None
+    :param sizes: input sizes to benchmark, interpreted by the input provider
+    :param repeats: number of timed runs of each implementation on each input
+    :param warmup: number of untimed runs preceding the timed ones
+    :param input_provider: function creating the input of a given size for a given day
+    :param progress: optional callback, called with each result as soon as it is available
+    :return: list of BenchmarkResults
+    """
+    sizes = sizes or DEFAULT_SIZES
+    results: list[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as directory:
+        input_paths: dict[tuple[int, int], Optional[Path]] = {}
+        for (day, part), day_implementations in implementations().items():
+            if days is not None and day not in days:
+                continue
+            for size in sizes:
+                if (day, size) not in input_paths:
+                    input_paths[(day, size)] = input_provider(day, size, Path(directory))
+                file_path = input_paths[(day, size)]
+                if file_path is None:
+                    continue
+                for name, solver in day_implementations.items():
+                    timings = time_solver(solver, file_path, repeats, warmup)
+                    result = BenchmarkResult(
+                        day=day,
+                        part=part,
+                        implementation=name,
+                        size=size,
+                        median_ns=statistics.median(timings),
+                        p95_ns=percentile(timings, 0.95),
+                        min_ns=min(timings),
+                        repeats=repeats
+                    )
+                    results.append(result)
+                    if progress:
+                        progress(result)
+    return results
+
+
+def save_results(results: list[BenchmarkResult], file_path: Union[str, Path]) -> None:
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": [result._asdict() for result in results]
+    }
+    with open(file_path, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def load_results(file_path: Union[str, Path]) -> list[BenchmarkResult]:
+    with open(file_path, "r") as file:
+        report = json.load(file)
+    return [BenchmarkResult(**result) for result in report["results"]]
+
+
+def find_regressions(
+        results: list[BenchmarkResult],
+        baseline: list[BenchmarkResult],
+        threshold: float = DEFAULT_THRESHOLD
+) -> list[Regression]:
+    """
+    Compare results against a baseline, matching them by day, part, implementation and size.
+
+    :param results: results of the current run
+    :param baseline: results of an earlier run
+    :param threshold: relative slowdown of the median tolerated before flagging a regression, 0.1 meaning 10%
+    :return: list of Regressions, for results without a baseline nothing is reported
+    """
+    baseline_medians = {
+        (result.day, result.part, result.implementation, result.size): result.median_ns for result in baseline
+    }
+    regressions = []
+    for result in results:
+        baseline_median = baseline_medians.get((result.day, result.part, result.implementation, result.size))
+        if baseline_median and result.median_ns > baseline_median * (1 + threshold):
+            regressions.append(Regression(result, baseline_median))
+    return regressions
+
+
+def format_result(result: BenchmarkResult) -> str:
+    return (
+        f"day {result.day} part {result.part} {result.implementation:<16} size {result.size:<10} "
+        f"median {result.median_ns / 1_000_000:10.3f} ms  p95 {result.p95_ns / 1_000_000:10.3f} ms"
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m advent.benchmark", description="Benchmark all solutions.")
+    parser.add_argument("--days", type=int, nargs="+", help="days to benchmark, all of them if omitted")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="input sizes to sweep")
+    parser.add_argument(
+        "--generated",
+        action="store_true",
+        help="use synthetic inputs of the given sizes, rather than the puzzle input repeated size times"
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="number of timed runs")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="number of untimed runs beforehand")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    parser.add_argument("--compare", type=Path, help="JSON file with baseline results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown of the median counted as a regression"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results = run_benchmarks(
+        days=args.days,
+        sizes=args.sizes,
+        repeats=args.repeats,
+        warmup=args.warmup,
+        input_provider=generated_input if args.generated else replicated_input,
+        progress=lambda result: print(format_result(result))
+    )
+    if args.output:
+        save_results(results, args.output)
+    if args.compare:
+        regressions = find_regressions(results, load_results(args.compare), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {format_result(regression.result)}  ({regression.slowdown:.2f}x baseline)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,222 @@
+"""
+On-disk cache of parsed inputs, keyed by a hash of the input file's contents.
+
+Parsers opt in with the cached_parser decorator, providing functions which convert their result to and from a dict
+of flat arrays (array.array or bytes). Entries are stored in a compact binary format: a small JSON header describing
+the arrays, followed by their raw contents - no pickling of object graphs.
+
+The cache is disabled until a directory is configured, either by calling configure() or through the
+ADVENT_CACHE_DIR environment variable. Once the cache grows over its size limit, the least recently used entries
+are evicted.
+"""
+import gc
+import hashlib
+import json
+import os
+import struct
+from array import array
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional, TypeVar, Union
+from advent.common import MappedInput
+
+
+CACHE_DIR_VARIABLE = "ADVENT_CACHE_DIR"
+DEFAULT_MAX_BYTES = 1 << 30
+MAGIC = b"ADVC"
+FORMAT_VERSION = 1
+HEADER_LENGTH = struct.Struct("<I")
+
+Arrays = dict[str, Union[array, bytes]]
+Parsed = TypeVar("Parsed")
+
+_cache_dir: Optional[Path] = None
+_max_bytes = DEFAULT_MAX_BYTES
+_configured = False
+
+
+def configure(directory: Optional[Union[str, Path]], max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    """
+    Enable the cache, storing entries in the given directory, or disable it if directory is None.
+
+    :param directory: directory to store cache entries in, created if necessary
+    :param max_bytes: total size of entries above which the least recently used ones are evicted
+    """
+    global _cache_dir, _max_bytes, _configured
+    _cache_dir = None if directory is None else Path(directory)
+    _max_bytes = max_bytes
+    _configured = True
+    if _cache_dir is not None:
+        _cache_dir.mkdir(parents=True, exist_ok=True)
+
+
+def cache_dir() -> Optional[Path]:
+    """
+    The configured cache directory, or None if the cache is disabled.
+    """
+    if not _configured:
+        configure(os.environ.get(CACHE_DIR_VARIABLE) or None)
+    return _cache_dir
+
+
+def content_hash(file_path: Union[str, Path]) -> str:
+    """
+    Hash of the contents of a file, as a hex string.
+    """
+    with MappedInput(file_path) as mapped:
+        return hashlib.blake2b(mapped.buffer, digest_size=16).hexdigest()
+
+
+def dump_arrays(arrays: Arrays, file_path: Union[str, Path]) -> None:
+    """
+    Write a dict of arrays to a file, replacing it atomically.
+    """
+    header = {
+        "version": FORMAT_VERSION,
+        "arrays": [
+            [name, values.typecode if isinstance(values, array) else None, len(values)]
+            for name, values in arrays.items()
+        ]
+    }
+    header_bytes = json.dumps(header).encode()
+    temporary_path = Path(f"{file_path}.{os.getpid()}.tmp")
+    with open(temporary_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(HEADER_LENGTH.pack(len(header_bytes)))
+        file.write(header_bytes)
+        for values in arrays.values():
+            file.write(values)
+    os.replace(temporary_path, file_path)
+
+
+def load_arrays(file_path: Union[str, Path]) -> Arrays:
+    """
+    Read a dict of arrays written by dump_arrays.
+
+    :raises ValueError: if the file is not in the expected format
+    """
+    with open(file_path, "rb") as file:
+        contents = file.read()
+    if contents[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{file_path} is not a cache entry")
+    position = len(MAGIC) + HEADER_LENGTH.size
+    try:
+        (header_length,) = HEADER_LENGTH.unpack_from(contents, len(MAGIC))
+    except struct.error as error:
+        raise ValueError(f"{file_path} is truncated") from error
+    header = json.loads(contents[position:position + header_length])
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"{file_path} has unsupported format version {header['version']}")
+    position += header_length
+    arrays: Arrays = {}
+    for name, typecode, length in header["arrays"]:
+        if typecode is None:
+            arrays[name] = contents[position:position + length]
+            position += length
+        else:
+            values = array(typecode)
+            end = position + length * values.itemsize
+            values.frombytes(contents[position:end])
+            arrays[name] = values
+            position = end
+    if position > len(contents):
+        raise ValueError(f"{file_path} is truncated")
+    return arrays
+
+
+def evict(directory: Path, max_bytes: int) -> None:
+    """
+    Remove least recently used entries from the cache directory until their total size is at most max_bytes.
+    """
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".bin"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+
+def cached_parser(
+        name: str,
+        encode: Callable[[Parsed], Arrays],
+        decode: Callable[[Arrays], Parsed]
+) -> Callable[[Callable[[Union[str, Path]], Parsed]], Callable[[Union[str, Path]], Parsed]]:
+    """
+    Decorator for a parser taking the path to an input file, which makes it reuse results cached for inputs with
+    identical contents.
+
+    :param name: unique name of the parser, including a version to bump whenever its output changes
+    :param encode: function converting the parser's result into a dict of arrays
+    :param decode: function converting a dict of arrays back into the parser's result
+    :return: decorator
+    """
+    def decorator(parser: Callable[[Union[str, Path]], Parsed]) -> Callable[[Union[str, Path]], Parsed]:
+        @wraps(parser)
+        def wrapper(file_path: Union[str, Path]) -> Parsed:
+            directory = cache_dir()
+            if directory is None:
+                return parser(file_path)
+            entry_path = Path(directory, f"{name}-{content_hash(file_path)}.bin")
+            # decoding creates lots of objects and no garbage, so collections triggered along the way would only
+            # keep traversing the growing result
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                parsed = decode(load_arrays(entry_path))
+            except (FileNotFoundError, ValueError):
+                pass
+            else:
+                # mark the entry as recently used
+                os.utime(entry_path)
+                return parsed
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            parsed = parser(file_path)
+            dump_arrays(encode(parsed), entry_path)
+            evict(directory, _max_bytes)
+            return parsed
+
+        wrapper.uncached = parser
+        return wrapper
+
+    return decorator
+
+
+def strings_to_bytes(strings: list[str]) -> bytes:
+    """
+    Pack a list of strings without newlines into a single bytes object, to be unpacked by bytes_to_strings.
+    """
+    return "\n".join(strings).encode()
+
+
+def bytes_to_strings(packed: bytes, count: int) -> list[str]:
+    if not count:
+        return []
+    return packed.decode().split("\n")
+
+
+def cache_entries() -> list[Path]:
+    """
+    Paths of all entries currently in the cache, empty if the cache is disabled.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return []
+    return sorted(Path(directory).glob("*.bin"))
+
+
+def clear() -> None:
+    """
+    Remove all entries from the cache.
+    """
+    for entry_path in cache_entries():
+        entry_path.unlink(missing_ok=True)
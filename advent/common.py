@@ -1,22 +1,282 @@
+import codecs
+import importlib.util
+import io
+import mmap
 import os
+import stat
+from array import array
+from itertools import accumulate
 from pathlib import Path
-from typing import Generator, Union
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Callable, Generator, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    # only needed for annotations, asyncio itself is slow to import
+    from asyncio import StreamReader
 
 
 current_dir = Path(os.path.realpath(__file__)).parent
 INPUTS_FOLDER = Path(current_dir, "inputs")
 TEST_INPUTS_FOLDER = Path(current_dir, "tests", "inputs")
 
+ENCODING = "utf-8"
+CHUNK_SIZE = 1 << 20
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+class MappedInput:
+    """
+    Read-only, memory-mapped view of an input file.
+
+    The file contents are exposed as bytes-like memoryview slices, so reading lines neither decodes nor copies
+    anything. The offsets of line starts are only computed when first needed (for len(), line() or line_offsets).
+
+    Slices handed out by lines() and line() point straight into the mapping - they must not be used after close().
+
+    Inputs which cannot be mapped, such as pipes or /dev/stdin (and files like those in /proc, which report a size
+    of 0), are read into memory instead, behind the same interface.
+
+    Usage:
+
+        with MappedInput(file_path) as mapped:
+            for line in mapped.lines():
+                ...
+    """
+    file_path: Path
+    size: int
+
+    def __init__(self, file_path: Union[str, Path]) -> None:
+        self.file_path = Path(file_path)
+        self._mmap: Optional[mmap.mmap] = None
+        self._line_offsets: Optional[array] = None
+        with open(self.file_path, "rb") as file:
+            file_stat = os.fstat(file.fileno())
+            # zero-length files cannot be mapped, and neither can pipes, whose size is reported as 0 as well
+            if stat.S_ISREG(file_stat.st_mode) and file_stat.st_size:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._contents: Union[mmap.mmap, bytes] = self._mmap
+            else:
+                self._contents = file.read()
+        self.size = len(self._contents)
+        self._buffer = memoryview(self._contents)
+
+    def __enter__(self) -> "MappedInput":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.line_offsets) - 1
+
+    @property
+    def buffer(self) -> memoryview:
+        """
+        The entire file contents, as a memoryview of unsigned bytes.
+        """
+        return self._buffer
+
+    @property
+    def line_offsets(self) -> array:
+        """
+        Byte offsets of the start of every line, followed by the size of the file as a sentinel, so that line i
+        spans line_offsets[i]:line_offsets[i + 1] (including its line terminator).
+
+        A final line without a terminating newline still counts as a line, an empty file has no lines.
+        """
+        if self._line_offsets is None:
+            self._line_offsets = self._build_line_offsets()
+        return self._line_offsets
+
+    def _build_line_offsets(self) -> array:
+        offsets = array("q", [0])
+        for begin, end in self.chunks():
+            line_lengths = map((1).__add__, map(len, self._contents[begin:end].split(b"\n")))
+            # the last element is whatever follows the last newline of the chunk - empty unless the file does not
+            # end with a newline, in which case it is covered by the sentinel
+            offsets.extend(accumulate(line_lengths, initial=offsets.pop()))
+            offsets.pop()
+        if offsets[-1] != self.size:
+            offsets.append(self.size)
+        return offsets
+
+    def chunks(
+            self,
+            chunk_size: int = CHUNK_SIZE,
+            separator: bytes = b"\n",
+            begin: int = 0
+    ) -> Generator[tuple[int, int], None, None]:
+        """
+        Generator yielding (begin, end) byte offsets which split the file into chunks of roughly chunk_size bytes.
+        Every chunk ends right after a separator (except possibly the last one), so by default no line is split
+        between chunks - with separator b"\n\n", no record of lines delimited by blank lines is split either.
+
+        :param chunk_size: approximate size of each chunk in bytes
+        :param separator: byte string after which chunks may end
+        :param begin: byte offset to start at, should be right after a separator
+        """
+        while begin < self.size:
+            end = begin + chunk_size
+            if end >= self.size:
+                end = self.size
+            else:
+                found = self._contents.rfind(separator, begin, end)
+                if found == -1:
+                    found = self._contents.find(separator, end)
+                end = self.size if found == -1 else found + len(separator)
+            yield begin, end
+            begin = end
+
+    def line_terminator(self) -> bytes:
+        """
+        The line terminator of the file, as used by its first line: b"\r\n" or b"\n" (also if it has no lines).
+        """
+        first_newline = self._contents.find(b"\n")
+        return b"\r\n" if first_newline > 0 and self._contents[first_newline - 1] == ord("\r") else b"\n"
+
+    def count_newlines(self, begin: int = 0, end: Optional[int] = None) -> int:
+        """
+        Count the newlines between the given byte offsets.
+
+        Neither memoryview nor mmap can count occurrences in place, so the mapping is counted in windows of
+        CHUNK_SIZE bytes - only one window at a time is copied, however large the range is.
+
+        :param begin: byte offset to start counting at
+        :param end: byte offset to stop counting at, defaults to the end of the file
+        """
+        end = self.size if end is None else end
+        if isinstance(self._contents, bytes):
+            return self._contents.count(b"\n", begin, end)
+        count = 0
+        for window_begin in range(begin, end, CHUNK_SIZE):
+            count += self._contents[window_begin:min(window_begin + CHUNK_SIZE, end)].count(b"\n")
+        return count
+
+    def line(self, index: int, keepends: bool = False) -> memoryview:
+        """
+        Return a zero-copy slice of the line with the given index.
+
+        :param index: index of the line, starting from 0
+        :param keepends: whether to include the line terminator in the slice
+        :return: memoryview of the line
+        """
+        offsets = self.line_offsets
+        begin = offsets[index]
+        end = offsets[index + 1]
+        if not keepends:
+            end = _strip_line_terminator(self._buffer, begin, end)
+        return self._buffer[begin:end]
+
+    def lines(
+            self,
+            keepends: bool = False,
+            begin: int = 0,
+            end: Optional[int] = None
+    ) -> Generator[memoryview, None, None]:
+        """
+        Generator yielding zero-copy slices of the lines in the file, without building the line index.
+
+        Each slice is released as soon as the next one is requested, so a slice which needs to be kept around has
+        to be copied (for example with bytes()).
+
+        :param keepends: whether to include line terminators in the slices
+        :param begin: byte offset to start reading at, should be the start of a line
+        :param end: byte offset to stop reading at, defaults to the end of the file
+        """
+        if end is None:
+            end = self.size
+        buffer = self._buffer
+        find = self._contents.find
+        while begin < end:
+            newline = find(b"\n", begin, end)
+            line_end = end if newline == -1 else newline + 1
+            slice_end = line_end if keepends else _strip_line_terminator(buffer, begin, line_end)
+            with buffer[begin:slice_end] as line:
+                yield line
+            begin = line_end
+
+    def close(self) -> None:
+        self._buffer.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # slices of the mapping are still referenced somewhere - the mapping gets closed once they are gone
+                pass
+            self._mmap = None
+        self._contents = b""
+
+
+def _strip_line_terminator(buffer: memoryview, begin: int, end: int) -> int:
+    """
+    Given the boundaries of a line within buffer, return the end of the line without its '\n' or '\r\n'.
+    """
+    if end > begin and buffer[end - 1] == 10:
+        end -= 1
+        if end > begin and buffer[end - 1] == 13:
+            end -= 1
+    return end
+
+
+def import_numpy():
+    """
+    Import numpy, an optional dependency only needed by the vectorized solvers.
+
+    :return: the numpy module
+    :raises ImportError: if numpy is not installed
+    """
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError("the vectorized solvers need numpy, install it with 'pip install numpy'") from error
+    return numpy
+
+
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def select_part(solver: Callable[[Union[str, Path]], tuple], part: int, file_path: Union[str, Path]) -> Any:
+    """
+    Solve a single part of a day with a solver answering all of its parts at once, for example
+    partial(select_part, calculate_both_total_scores, 2) to solve just the second part.
+
+    :param solver: function taking the path to an input file and returning the answers to all parts, in order
+    :param part: part whose answer to return
+    :param file_path: path to input file
+    """
+    return solver(file_path)[part - 1]
+
 
 def yield_lines(file_path: Union[str, Path]) -> Generator[str, None, None]:
     """
     Generator yielding file at given file_path line by line.
 
+    The file is decoded in large chunks rather than line by line, line endings are translated to '\n' just like
+    when reading in text mode. Inputs which are not regular files, such as pipes, are read in text mode, so that
+    they are not held in memory all at once.
+
     :param file_path: path of file which to read
     """
-    with open(file_path, "r") as reader:
-        for line in reader:
-            yield line
+    for lines in yield_line_batches(file_path):
+        yield from lines
+
+
+def yield_line_batches(file_path: Union[str, Path]) -> Generator[Iterator[str], None, None]:
+    """
+    Generator yielding, for each chunk of the file at given file_path, an iterator over the lines it contains - the
+    lines yield_lines yields one by one, for consumers which loop over them directly, or which measure reading and
+    decoding the input separately from going through its lines. Each iterator must be consumed before the next one
+    is requested.
+
+    :param file_path: path of file which to read
+    """
+    if not stat.S_ISREG(os.stat(file_path).st_mode):
+        with open(file_path, "r", encoding=ENCODING) as file:
+            yield file
+        return
+    with MappedInput(file_path) as mapped:
+        for begin, end in mapped.chunks():
+            yield io.StringIO(str(mapped.buffer[begin:end], ENCODING), None)
 
 
 def read_file(file_path: Union[str, Path]) -> str:
@@ -26,6 +286,75 @@ def read_file(file_path: Union[str, Path]) -> str:
     :param file_path: path of file which to read
     :return: entire file contents as str
     """
-    with open(file_path, "r") as file:
-        contents = file.read()
-        return contents
+    with MappedInput(file_path) as mapped:
+        contents = str(mapped.buffer, ENCODING)
+    if "\r" in contents:
+        contents = contents.replace("\r\n", "\n").replace("\r", "\n")
+    return contents
+
+
+async def async_yield_text(
+        reader: "StreamReader",
+        chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncGenerator[str, None]:
+    """
+    Asynchronous generator yielding the text read from a stream, chunk by chunk as it arrives.
+
+    Line endings are translated to '\n' just like when reading in text mode. Chunks can end anywhere, even in the
+    middle of a line (but never in the middle of a character).
+
+    :param reader: stream to read from
+    :param chunk_size: maximum number of bytes to read at once
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(ENCODING)(), translate=True)
+    while chunk := await reader.read(chunk_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+async def async_yield_line_batches(
+        reader: "StreamReader",
+        chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncGenerator[Iterator[str], None]:
+    """
+    Asynchronous generator yielding, for each chunk read from a stream, an iterator over the complete lines it
+    contains, so that consumers can process the lines of a chunk in a plain (synchronous) loop.
+
+    The stream is read and decoded chunk by chunk, only the incomplete line at the end of a chunk is held back
+    until the rest of it arrives.
+
+    :param reader: stream to read from
+    :param chunk_size: maximum number of bytes to read at once
+    """
+    pending = bytearray()
+    while chunk := await reader.read(chunk_size):
+        last_newline = chunk.rfind(b"\n")
+        if last_newline == -1:
+            pending += chunk
+            continue
+        pending += chunk[:last_newline + 1]
+        lines = io.StringIO(str(pending, ENCODING), None)
+        pending = bytearray(chunk[last_newline + 1:])
+        yield lines
+    if pending:
+        yield io.StringIO(str(pending, ENCODING), None)
+
+
+async def async_yield_lines(
+        reader: "StreamReader",
+        chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncGenerator[str, None]:
+    """
+    Asynchronous generator yielding the lines read from a stream one by one, the asynchronous counterpart of
+    yield_lines, see async_yield_line_batches.
+
+    :param reader: stream to read from
+    :param chunk_size: maximum number of bytes to read at once
+    """
+    async for lines in async_yield_line_batches(reader, chunk_size):
+        for line in lines:
+            yield line
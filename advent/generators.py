@@ -0,0 +1,325 @@
+"""
+Generators of synthetic, arbitrarily large puzzle inputs, usable as 'python -m advent.generators DAY SIZE OUTPUT'.
+
+Every generator writes a valid input for its day, of the given size, to an open text file. Output is fully determined
+by the seed of the random number generator passed in, so the same (day, size, seed) always produce the same file.
+Lines are written in batches, so that memory use does not depend on the size of the input.
+
+What size means depends on the day, see the docstring of each generator.
+"""
+import argparse
+import random
+import string
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO, Union
+
+
+BATCH_SIZE = 10_000
+
+RUCKSACK_LETTERS = string.ascii_lowercase + string.ascii_uppercase
+CRATE_LETTERS = string.ascii_uppercase
+DIRECTIONS = "RLUD"
+
+
+def write_batched(file: TextIO, lines: Iterator[str]) -> None:
+    """
+    Write lines (each including its line terminator) to file, BATCH_SIZE lines at a time.
+    """
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == BATCH_SIZE:
+            file.writelines(batch)
+            batch.clear()
+    file.writelines(batch)
+
+
+def generate_calories(file: TextIO, size: int, rng: random.Random, max_items: int = 15) -> None:
+    """
+    Day 1: size blocks of calorie counts, one per elf, separated by empty lines.
+
+    :param file: file to write to
+    :param size: number of elves
+    :param rng: random number generator
+    :param max_items: maximum number of items carried by a single elf
+    """
+    def lines() -> Iterator[str]:
+        for elf in range(size):
+            if elf:
+                yield "\n"
+            for _ in range(rng.randint(1, max_items)):
+                yield f"{rng.randint(1000, 60000)}\n"
+
+    write_batched(file, lines())
+
+
+def generate_strategy_guide(file: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Day 2: size rounds of rock-paper-scissors, such as 'A Y'.
+
+    :param file: file to write to
+    :param size: number of rounds
+    :param rng: random number generator
+    """
+    rounds = [f"{opponent} {me}\n" for opponent in "ABC" for me in "XYZ"]
+    write_batched(file, (rng.choice(rounds) for _ in range(size)))
+
+
+def generate_rucksacks(file: TextIO, size: int, rng: random.Random, max_compartment: int = 24) -> None:
+    """
+    Day 3: size rucksacks (rounded up to a multiple of three), one per line.
+
+    Within each rucksack exactly one letter is found in both compartments, and within each group of three consecutive
+    rucksacks exactly one letter (the badge) is found in all three of them. The badge is placed in the first
+    compartment of each rucksack, other than that the three rucksacks of a group use disjoint sets of letters.
+
+    :param file: file to write to
+    :param size: number of rucksacks
+    :param rng: random number generator
+    :param max_compartment: maximum number of items in one compartment
+    """
+    def group() -> Iterator[str]:
+        letters = list(RUCKSACK_LETTERS)
+        rng.shuffle(letters)
+        badge = letters.pop()
+        pool_size = len(letters) // 3
+        for pools in range(3):
+            pool = letters[pools * pool_size:(pools + 1) * pool_size]
+            half = len(pool) // 2
+            first_pool, second_pool = pool[:half], pool[half:]
+            common = rng.choice(first_pool)
+            compartment_size = rng.randint(3, max_compartment)
+            first = [badge, common] + rng.choices(first_pool, k=compartment_size - 2)
+            second = [common] + rng.choices(second_pool, k=compartment_size - 1)
+            rng.shuffle(first)
+            rng.shuffle(second)
+            yield "".join(first) + "".join(second) + "\n"
+
+    def lines() -> Iterator[str]:
+        for _ in range(-(-size // 3)):
+            yield from group()
+
+    write_batched(file, lines())
+
+
+def generate_section_assignments(file: TextIO, size: int, rng: random.Random, max_section: int = 99) -> None:
+    """
+    Day 4: size pairs of section assignments, such as '2-6,4-8'.
+
+    :param file: file to write to
+    :param size: number of pairs
+    :param rng: random number generator
+    :param max_section: highest section number
+    """
+    def section_range() -> str:
+        begin = rng.randint(1, max_section)
+        return f"{begin}-{rng.randint(begin, max_section)}"
+
+    write_batched(file, (f"{section_range()},{section_range()}\n" for _ in range(size)))
+
+
+def generate_crates(
+        file: TextIO,
+        size: int,
+        rng: random.Random,
+        stack_count: int = 9,
+        stack_height: int = 48,
+        max_move: int = 30
+) -> None:
+    """
+    Day 5: a drawing of stack_count stacks of crates followed by size moves.
+
+    The initial height of every stack is between 2 and stack_height. Moves never empty a stack completely, so every
+    stack has a crate on top at the end.
+
+    :param file: file to write to
+    :param size: number of moves
+    :param rng: random number generator
+    :param stack_count: number of stacks
+    :param stack_height: maximum initial height of a stack
+    :param max_move: maximum number of crates moved at once
+    """
+    heights = [rng.randint(2, max(stack_height, 2)) for _ in range(stack_count)]
+    tallest = max(heights)
+    for level in range(tallest, 0, -1):
+        crates = [f"[{rng.choice(CRATE_LETTERS)}]" if height >= level else "   " for height in heights]
+        file.write(" ".join(crates).rstrip() + "\n")
+    file.write(" ".join(f"{stack:^3}" for stack in range(1, stack_count + 1)) + "\n\n")
+
+    def moves() -> Iterator[str]:
+        for _ in range(size):
+            from_index = rng.randrange(stack_count)
+            while heights[from_index] < 2:
+                from_index = rng.randrange(stack_count)
+            to_index = rng.randrange(stack_count - 1)
+            if to_index >= from_index:
+                to_index += 1
+            count = rng.randint(1, min(heights[from_index] - 1, max_move))
+            heights[from_index] -= count
+            heights[to_index] += count
+            yield f"move {count} from {from_index + 1} to {to_index + 1}\n"
+
+    write_batched(file, moves())
+
+
+def generate_datastream(file: TextIO, size: int, rng: random.Random, marker_length: int = 14) -> None:
+    """
+    Day 6: a datastream of size characters, whose first window of marker_length distinct characters (and so also
+    the first window of four distinct characters) is found near its end.
+
+    Until the marker, the stream is made of pairs of equal letters, so that every window of three or more characters
+    contains a repeated letter. The marker is followed by a few more pairs.
+
+    :param file: file to write to
+    :param size: number of characters, at least marker_length
+    :param rng: random number generator
+    :param marker_length: length of the window of distinct characters
+    """
+    size = max(size, marker_length)
+    tail_length = min(8, size - marker_length) // 2 * 2
+    prefix_length = size - marker_length - tail_length
+
+    def pairs(length: int) -> Iterator[str]:
+        for _ in range(length // 2):
+            yield rng.choice(string.ascii_lowercase) * 2
+        if length % 2:
+            yield rng.choice(string.ascii_lowercase)
+
+    write_batched(file, pairs(prefix_length))
+    file.write("".join(rng.sample(string.ascii_lowercase, marker_length)))
+    write_batched(file, pairs(tail_length))
+
+
+def generate_terminal_session(
+        file: TextIO,
+        size: int,
+        rng: random.Random,
+        max_depth: int = 100,
+        max_files: int = 4,
+        total_size: int = 50_000_000
+) -> None:
+    """
+    Day 7: a session of 'cd' and 'ls' commands exploring a file system of size directories.
+
+    The file system is explored depth first, every directory up to max_depth levels deep gets one to three
+    sub-directories while there are directories left to create, so the first branches go all the way down.
+
+    File sizes are scaled so that all files together take up about total_size, which with the default leaves too
+    little free space on the 70 000 000 disk of part 2, regardless of the number of directories.
+
+    :param file: file to write to
+    :param size: number of directories, including the root
+    :param rng: random number generator
+    :param max_depth: maximum depth of the directory tree
+    :param max_files: maximum number of files in a single directory
+    :param total_size: expected sum of the sizes of all files
+    """
+    max_file_size = max(2 * total_size // max(size * max_files // 2, 1), 1)
+
+    def lines() -> Iterator[str]:
+        remaining = size - 1
+        directory_count = 1
+        yield "$ cd /\n"
+        # each entry is the name of a directory to enter and its depth, or None to go back up
+        stack: list[Optional[tuple[str, int]]] = [None]
+        depth = 0
+        while True:
+            yield "$ ls\n"
+            sub_directories = []
+            if depth < max_depth and remaining:
+                for _ in range(min(rng.randint(1, 3), remaining)):
+                    sub_directories.append(f"d{directory_count}")
+                    directory_count += 1
+                    remaining -= 1
+            entries = [f"dir {name}\n" for name in sub_directories]
+            entries.extend(f"{rng.randint(1, max_file_size)} f{j}.txt\n" for j in range(rng.randint(0, max_files)))
+            rng.shuffle(entries)
+            yield from entries
+            for name in reversed(sub_directories):
+                stack.append(None)
+                stack.append((name, depth + 1))
+            # go back up until there is a directory to enter next
+            while stack:
+                entry = stack.pop()
+                if entry is not None:
+                    break
+                if stack:
+                    yield "$ cd ..\n"
+            else:
+                return
+            name, depth = entry
+            yield f"$ cd {name}\n"
+
+    write_batched(file, lines())
+
+
+def generate_tree_grid(file: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Day 8: a square grid of tree heights.
+
+    :param file: file to write to
+    :param size: number of rows and columns of the grid
+    :param rng: random number generator
+    """
+    write_batched(file, ("".join(rng.choices(string.digits, k=size)) + "\n" for _ in range(size)))
+
+
+def generate_rope_moves(file: TextIO, size: int, rng: random.Random, max_steps: int = 19) -> None:
+    """
+    Day 9: size moves of the head of the rope, such as 'R 4'.
+
+    :param file: file to write to
+    :param size: number of moves
+    :param rng: random number generator
+    :param max_steps: maximum number of steps in a single move
+    """
+    write_batched(file, (f"{rng.choice(DIRECTIONS)} {rng.randint(1, max_steps)}\n" for _ in range(size)))
+
+
+GENERATORS: dict[int, Callable[..., None]] = {
+    1: generate_calories,
+    2: generate_strategy_guide,
+    3: generate_rucksacks,
+    4: generate_section_assignments,
+    5: generate_crates,
+    6: generate_datastream,
+    7: generate_terminal_session,
+    8: generate_tree_grid,
+    9: generate_rope_moves
+}
+
+
+def generate_input(day: int, size: int, file_path: Union[str, Path], seed: int = 0, **options) -> Path:
+    """
+    Write a synthetic input for the given day to file_path.
+
+    :param day: day to generate input for
+    :param size: size of the input, meaning depends on the day
+    :param file_path: path of the file to write
+    :param seed: seed of the random number generator
+    :param options: additional keyword arguments for the day's generator
+    :return: path of the written file
+    """
+    file_path = Path(file_path)
+    with open(file_path, "w", newline="\n") as file:
+        GENERATORS[day](file, size, random.Random(seed), **options)
+    return file_path
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m advent.generators", description="Generate synthetic inputs.")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS), help="day to generate input for")
+    parser.add_argument("size", type=int, help="size of the input, meaning depends on the day")
+    parser.add_argument("output", type=Path, help="file to write the input to")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random number generator")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    generate_input(args.day, args.size, args.output, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
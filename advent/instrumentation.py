@@ -0,0 +1,295 @@
+"""
+Lightweight instrumentation of the phases of the solvers - how much time is spent parsing input, and how much
+computing the answer.
+
+Functions are marked as phases with the phase decorator, and blocks of code with the span context manager. For each
+phase, the number of calls, the total wall time and the net number of memory blocks allocated are collected into a
+registry, which can be queried with get_stats(). Phases can be nested: besides its total time, each phase records its
+self time, which leaves out the time spent in phases nested in it, so that the self times of all phases add up to at
+most the wall time. For generator functions, the time spent producing each item is measured, not the time the
+consumer spends in between.
+
+Instrumentation is disabled by default. The phase decorator returns the function unchanged and only remembers it,
+enable() then replaces the function in its module (or class) with an instrumented wrapper, and disable() puts the
+original back. So while disabled, marked functions run with no overhead at all, and span() only costs a check of a
+flag. Note that code which imported a marked function by name (or otherwise holds a reference to it) keeps calling
+the original - marked functions of other modules have to be called through their module.
+
+Usage:
+
+    with instrumented():
+        count_visible(file_path)
+    for name, stats in get_stats().items():
+        ...
+"""
+import importlib
+import sys
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator, NamedTuple, Optional, TypeVar
+
+
+PARSE = "parse"
+COMPUTE = "compute"
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+class PhaseStats(NamedTuple):
+    name: str
+    kind: str
+    calls: int
+    total_ns: int
+    self_ns: int
+    allocated_blocks: int
+
+
+class _Phase:
+    """
+    Mutable counters of a single phase. Nested (for example recursive) calls of the same phase are counted,
+    but only the outermost one is timed, so that time is not counted twice.
+    """
+    __slots__ = ("name", "kind", "calls", "total_ns", "self_ns", "allocated_blocks", "active")
+
+    def __init__(self, name: str, kind: str) -> None:
+        self.name = name
+        self.kind = kind
+        self.calls = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.allocated_blocks = 0
+        self.active = False
+
+    def snapshot(self) -> PhaseStats:
+        return PhaseStats(self.name, self.kind, self.calls, self.total_ns, self.self_ns, self.allocated_blocks)
+
+
+_enabled = False
+_phases: dict[str, _Phase] = {}
+# marked functions: (module name, qualified name, original function, phase name, phase kind)
+_marked: list[tuple[str, str, Callable, str, str]] = []
+# functions currently replaced by instrumented versions: (module name, qualified name, original function)
+_patched: list[tuple[str, str, Callable]] = []
+# phases being timed, innermost last: [phase, time spent in nested phases so far, allocated blocks at start, start]
+_timing: list[list] = []
+
+
+def _get_phase(name: str, kind: str) -> _Phase:
+    counters = _phases.get(name)
+    if counters is None:
+        counters = _phases[name] = _Phase(name, kind)
+    return counters
+
+
+def _start(counters: _Phase) -> Optional[list]:
+    """
+    Start timing a phase, unless it is already being timed further up the stack (for example in a recursive call).
+    """
+    if counters.active:
+        return None
+    counters.active = True
+    timing = [counters, 0, sys.getallocatedblocks(), perf_counter_ns()]
+    _timing.append(timing)
+    return timing
+
+
+def _stop(timing: Optional[list]) -> None:
+    """
+    Stop timing a phase started by _start, adding its time to the nested time of the phase it is nested in.
+    """
+    if timing is None:
+        return
+    counters, nested_ns, blocks, start = timing
+    elapsed = perf_counter_ns() - start
+    _timing.pop()
+    counters.total_ns += elapsed
+    counters.self_ns += elapsed - nested_ns
+    counters.allocated_blocks += sys.getallocatedblocks() - blocks
+    counters.active = False
+    if _timing:
+        _timing[-1][1] += elapsed
+
+
+def _instrument(function: Callable, name: str, kind: str) -> Callable:
+    from inspect import isgeneratorfunction
+
+    counters = _get_phase(name, kind)
+
+    if isgeneratorfunction(function):
+        @wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            counters.calls += 1
+            generator = function(*args, **kwargs)
+            while True:
+                timing = _start(counters)
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    _stop(timing)
+                yield item
+
+        return generator_wrapper
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        counters.calls += 1
+        timing = _start(counters)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _stop(timing)
+
+    return wrapper
+
+
+def phase(kind: str = COMPUTE, name: Optional[str] = None) -> Callable[[Function], Function]:
+    """
+    Decorator marking a function (or method) as a phase of a solver. Unless instrumentation is enabled at the time
+    the function is defined, the function itself is returned unchanged.
+
+    It has to be the outermost decorator, except for classmethod and staticmethod, which go on top of it.
+
+    :param kind: kind of the phase, PARSE or COMPUTE
+    :param name: name of the phase, defaults to the module and qualified name of the function
+    :return: decorator
+    """
+    def decorator(function: Function) -> Function:
+        module_name = function.__module__
+        qualified_name = function.__qualname__
+        if "<locals>" in qualified_name:
+            raise ValueError(f"{qualified_name} is a local function, which cannot be instrumented")
+        phase_name = name or f"{module_name.rsplit('.', 1)[-1]}.{qualified_name}"
+        _marked.append((module_name, qualified_name, function, phase_name, kind))
+        if _enabled:
+            # the module is being imported while instrumentation is enabled
+            _patched.append((module_name, qualified_name, function))
+            return _instrument(function, phase_name, kind)
+        return function
+
+    return decorator
+
+
+@contextmanager
+def _span(counters: _Phase) -> Iterator[None]:
+    counters.calls += 1
+    timing = _start(counters)
+    try:
+        yield
+    finally:
+        _stop(timing)
+
+
+_NULL_SPAN = nullcontext()
+
+
+def span(name: str, kind: str = COMPUTE):
+    """
+    Context manager measuring a block of code as a phase, doing nothing while instrumentation is disabled.
+
+    :param name: name of the phase
+    :param kind: kind of the phase, PARSE or COMPUTE
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _span(_get_phase(name, kind))
+
+
+def _resolve(module_name: str, qualified_name: str) -> tuple[Any, str]:
+    """
+    Find the object (module or class) holding the function with the given qualified name, and its attribute name.
+    """
+    owner = importlib.import_module(module_name)
+    *owner_path, attribute = qualified_name.split(".")
+    for owner_name in owner_path:
+        owner = getattr(owner, owner_name)
+    return owner, attribute
+
+
+def _replace(module_name: str, qualified_name: str, function: Callable) -> None:
+    """
+    Replace the function with the given qualified name by another one, keeping it a classmethod or staticmethod.
+    """
+    owner, attribute = _resolve(module_name, qualified_name)
+    current = owner.__dict__[attribute]
+    if isinstance(current, (classmethod, staticmethod)):
+        function = type(current)(function)
+    setattr(owner, attribute, function)
+
+
+def enable() -> None:
+    """
+    Start collecting statistics, replacing all marked functions by instrumented versions.
+    """
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    for module_name, qualified_name, function, phase_name, kind in _marked:
+        _replace(module_name, qualified_name, _instrument(function, phase_name, kind))
+        _patched.append((module_name, qualified_name, function))
+
+
+def disable() -> None:
+    """
+    Stop collecting statistics, restoring all marked functions. Statistics collected so far are kept.
+    """
+    global _enabled
+    if not _enabled:
+        return
+    _enabled = False
+    while _patched:
+        _replace(*_patched.pop())
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def instrumented(reset_stats: bool = True) -> Iterator[None]:
+    """
+    Context manager enabling instrumentation for the duration of the block.
+
+    :param reset_stats: whether to discard statistics collected before
+    """
+    if reset_stats:
+        reset()
+    was_enabled = _enabled
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def get_stats() -> dict[str, PhaseStats]:
+    """
+    Statistics of all phases which have been called at least once, keyed by phase name.
+    """
+    return {name: counters.snapshot() for name, counters in _phases.items() if counters.calls}
+
+
+def get_totals() -> dict[str, int]:
+    """
+    Total time in nanoseconds spent in the phases of each kind. Time spent in a phase nested in another one only
+    counts towards the kind of the inner phase, so nothing is counted twice.
+    """
+    totals: dict[str, int] = {}
+    for stats in get_stats().values():
+        totals[stats.kind] = totals.get(stats.kind, 0) + stats.self_ns
+    return totals
+
+
+def reset() -> None:
+    """
+    Discard all statistics collected so far.
+    """
+    for counters in _phases.values():
+        counters.calls = 0
+        counters.total_ns = 0
+        counters.self_ns = 0
+        counters.allocated_blocks = 0
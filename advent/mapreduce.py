@@ -0,0 +1,181 @@
+"""
+Chunked, parallel solving of days whose input consists of independent lines (days 2, 3 and 4) or independent
+records of lines (day 1, where records are separated by blank lines).
+
+The input file is split into chunks at byte offsets which fall on line (or record) boundaries, each chunk is solved
+by the existing per-line functions of the day in a pool of worker processes, and the partial results are merged.
+Workers map the input file themselves, so only the offsets of each chunk and its partial result are sent between
+processes, no matter how large the input is.
+
+Usage:
+
+    answer = solve(1, 2, file_path, max_workers=8)
+"""
+import heapq
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, repeat
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, NamedTuple, Optional, Union
+from advent.common import ENCODING, MappedInput
+from advent.solutions import one, two, two_part2, three, four
+
+
+DEFAULT_CHUNK_SIZE = 1 << 24
+# in place of a part number, solve all parts of a day at once, the answer being a tuple of the answers of each part
+ALL_PARTS = 0
+
+
+class ChunkTask(NamedTuple):
+    """
+    How to solve one (day, part) chunk by chunk.
+
+    solve_chunk is given the lines of a chunk (or its raw bytes, if raw is set) and returns its partial result,
+    merge combines the partial results of all chunks into the answer. Chunks end right after separator, and contain
+    a multiple of group_size lines.
+    """
+    solve_chunk: Callable[[Iterable[str]], Any]
+    merge: Callable[[Iterable[Any]], Any]
+    separator: bytes = b"\n"
+    group_size: int = 1
+    raw: bool = False
+
+
+def top_calories(lines: Iterable[str], k: int) -> list[int]:
+    return heapq.nlargest(k, one.yield_calorie_totals(lines))
+
+
+def merge_top(partials: Iterable[list[int]], k: int) -> int:
+    return sum(heapq.nlargest(k, chain.from_iterable(partials)))
+
+
+def count_rounds(data: bytes) -> dict[tuple[str, str], int]:
+    counter = two.RoundCounter()
+    counter.feed(data)
+    return counter.finish()
+
+
+def score_rounds(partials: Iterable[dict[tuple[str, str], int]], score_table: dict[tuple[str, str], int]) -> int:
+    return two.score_counts(two.merge_counts(partials), score_table)
+
+
+def score_rounds_both_parts(partials: Iterable[dict[tuple[str, str], int]]) -> tuple[int, int]:
+    return two_part2.score_both_parts(two.merge_counts(partials))
+
+
+def sum_lines(lines: Iterable[str], score: Callable[[str], int]) -> int:
+    return sum(map(score, lines))
+
+
+def group_priority_sum(data: bytes, group_size: int = 3) -> int:
+    return three.sum_priorities(data.splitlines(), group_size, split_halves=False)[1]
+
+
+def sum_priorities(data: bytes, group_size: int = 3) -> tuple[int, int]:
+    return three.sum_priorities(data.splitlines(), group_size)
+
+
+def add_tuples(partials: Iterable[tuple[int, ...]]) -> tuple[int, ...]:
+    return tuple(map(sum, zip(*partials)))
+
+
+def count_pairs(lines: Iterable[str], predicate: Callable[[four.Range, four.Range], bool]) -> int:
+    return sum(1 for line in lines if predicate(*four.parse_ranges_line(line)))
+
+
+TASKS: dict[tuple[int, int], ChunkTask] = {
+    (1, 1): ChunkTask(partial(top_calories, k=1), partial(merge_top, k=1), separator=b"\n\n"),
+    (1, 2): ChunkTask(partial(top_calories, k=3), partial(merge_top, k=3), separator=b"\n\n"),
+    (2, 1): ChunkTask(count_rounds, partial(score_rounds, score_table=two.ROUND_SCORES), raw=True),
+    (2, 2): ChunkTask(count_rounds, partial(score_rounds, score_table=two_part2.ROUND_SCORES), raw=True),
+    (2, ALL_PARTS): ChunkTask(count_rounds, score_rounds_both_parts, raw=True),
+    (3, 1): ChunkTask(partial(sum_lines, score=three.calculate_line_priority), sum),
+    (3, 2): ChunkTask(group_priority_sum, sum, group_size=3, raw=True),
+    (3, ALL_PARTS): ChunkTask(sum_priorities, add_tuples, group_size=3, raw=True),
+    (4, 1): ChunkTask(partial(count_pairs, predicate=four.one_contains_other), sum),
+    (4, 2): ChunkTask(partial(count_pairs, predicate=four.ranges_overlap), sum)
+}
+
+
+def split_file(
+        mapped: MappedInput,
+        task: ChunkTask,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Generator[tuple[int, int], None, None]:
+    """
+    Generator yielding (begin, end) byte offsets of the chunks a file is split into for the given task.
+
+    Where lines have to stay in groups, consecutive chunks are joined until the number of lines up to the end of a
+    chunk is a multiple of the group size, which takes one more pass over the file to count newlines (on the
+    mapping itself, see MappedInput.count_newlines).
+
+    :param mapped: the mapped input file
+    :param task: the task the chunks are meant for
+    :param chunk_size: approximate size of each chunk in bytes
+    """
+    if task.group_size == 1:
+        yield from mapped.chunks(chunk_size, task.separator)
+        return
+    begin = line_count = 0
+    for chunk_begin, end in mapped.chunks(chunk_size, task.separator):
+        line_count += mapped.count_newlines(chunk_begin, end)
+        if end == mapped.size and mapped.buffer[end - 1] != ord("\n"):
+            line_count += 1
+        if line_count % task.group_size == 0 or end == mapped.size:
+            yield begin, end
+            begin = end
+
+
+def solve_chunk(day: int, part: int, file_path: Union[str, Path], begin: int, end: int) -> Any:
+    """
+    Solve a single chunk of the input file, returning its partial result.
+
+    :param day: day of the challenge
+    :param part: part of the day's challenge
+    :param file_path: path to input file
+    :param begin: byte offset of the start of the chunk
+    :param end: byte offset of the end of the chunk
+    :return: partial result of the chunk
+    """
+    task = TASKS[(day, part)]
+    with MappedInput(file_path) as mapped:
+        with mapped.buffer[begin:end] as chunk:
+            data = bytes(chunk) if task.raw else io.StringIO(str(chunk, ENCODING), None)
+    return task.solve_chunk(data)
+
+
+def solve(
+        day: int,
+        part: int,
+        file_path: Union[str, Path],
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Any:
+    """
+    Solve the given day and part, splitting the input file into chunks solved in a pool of worker processes.
+
+    Inputs which fit into a single chunk, or runs with a single worker, are solved in the calling process.
+
+    :param day: day of the challenge
+    :param part: part of the day's challenge, or ALL_PARTS
+    :param file_path: path to input file
+    :param max_workers: number of worker processes, defaults to the number of CPUs
+    :param chunk_size: approximate size of each chunk in bytes
+    :return: the answer
+    :raises LookupError: if the day and part cannot be solved chunk by chunk
+    """
+    task = TASKS.get((day, part))
+    if task is None:
+        raise LookupError(f"day {day} part {part} cannot be solved chunk by chunk")
+    with MappedInput(file_path) as mapped:
+        chunks = list(split_file(mapped, task, chunk_size))
+    max_workers = max_workers or os.cpu_count() or 1
+    if len(chunks) <= 1 or max_workers == 1:
+        partials = (solve_chunk(day, part, file_path, begin, end) for begin, end in chunks)
+        return task.merge(partials)
+    begins, ends = zip(*chunks)
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        partials = executor.map(solve_chunk, repeat(day), repeat(part), repeat(file_path), begins, ends)
+        return task.merge(partials)
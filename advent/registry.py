@@ -0,0 +1,103 @@
+"""
+Registry of all solutions, mapping each (day, part) to the module implementing it.
+
+Modules are only imported once a solution is requested, so solving a single day does not pay for importing the
+others (and whatever they import). Each module declares its solvers in PARTS and its puzzle input in
+INPUT_FILE_PATH, and modules able to read input from a stream rather than a file declare coroutine functions taking
+an asyncio.StreamReader in ASYNC_PARTS. Other implementations of a day, solving it differently from the solver in
+PARTS, are declared in ALTERNATIVE_PARTS, mapping part number to solvers keyed by a descriptive name - by any of
+the day's modules, as a single pass solving both parts may live in the module of either part. This registry only
+needs to know where to find them.
+"""
+import importlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, NamedTuple, Union
+
+
+Solver = Callable[[Union[str, Path]], Any]
+# takes an asyncio.StreamReader, which is not imported here as asyncio is slow to import
+AsyncSolver = Callable[[Any], Awaitable[Any]]
+
+MODULES: dict[tuple[int, int], str] = {
+    (1, 1): "advent.solutions.one",
+    (1, 2): "advent.solutions.one",
+    (2, 1): "advent.solutions.two",
+    (2, 2): "advent.solutions.two_part2",
+    (3, 1): "advent.solutions.three",
+    (3, 2): "advent.solutions.three_part2",
+    (4, 1): "advent.solutions.four",
+    (4, 2): "advent.solutions.four",
+    (5, 1): "advent.solutions.five",
+    (5, 2): "advent.solutions.five",
+    (6, 1): "advent.solutions.six",
+    (6, 2): "advent.solutions.six",
+    (7, 1): "advent.solutions.seven",
+    (7, 2): "advent.solutions.seven",
+    (8, 1): "advent.solutions.eight",
+    (8, 2): "advent.solutions.eight",
+    (9, 1): "advent.solutions.nine",
+    (9, 2): "advent.solutions.nine"
+}
+
+
+class Solution(NamedTuple):
+    day: int
+    part: int
+    solver: Solver
+    default_input: Path
+
+
+def days() -> list[int]:
+    return sorted({day for day, _ in MODULES})
+
+
+def parts(day: int) -> list[int]:
+    return sorted(part for solution_day, part in MODULES if solution_day == day)
+
+
+@lru_cache(maxsize=None)
+def get_solution(day: int, part: int) -> Solution:
+    """
+    Import the module solving the given day and part, and return its solution.
+
+    :param day: day of the challenge
+    :param part: part of the day's challenge
+    :return: Solution
+    :raises LookupError: if there is no solution for the given day and part
+    """
+    module_name = MODULES.get((day, part))
+    if module_name is None:
+        raise LookupError(f"no solution for day {day} part {part}")
+    module = importlib.import_module(module_name)
+    return Solution(day, part, module.PARTS[part], module.INPUT_FILE_PATH)
+
+
+def get_alternative_solvers() -> dict[tuple[int, int], dict[str, Solver]]:
+    """
+    Import all modules, and collect the alternative solvers each of them declares.
+
+    :return: dict mapping (day, part) to alternative solvers keyed by name, for days which have any
+    """
+    alternatives: dict[tuple[int, int], dict[str, Solver]] = {}
+    for module_name in sorted(set(MODULES.values())):
+        module = importlib.import_module(module_name)
+        for part, solvers in getattr(module, "ALTERNATIVE_PARTS", {}).items():
+            alternatives.setdefault((module.DAY, part), {}).update(solvers)
+    return alternatives
+
+
+def get_async_solver(day: int, part: int) -> AsyncSolver:
+    """
+    Import the module solving the given day and part, and return its solver reading input from a stream.
+
+    :param day: day of the challenge
+    :param part: part of the day's challenge
+    :return: coroutine function taking an asyncio.StreamReader
+    :raises LookupError: if there is no solution reading from a stream for the given day and part
+    """
+    module_name = MODULES.get((day, part))
+    async_parts = getattr(importlib.import_module(module_name), "ASYNC_PARTS", {}) if module_name else {}
+    if part not in async_parts:
+        raise LookupError(f"no solution reading from a stream for day {day} part {part}")
+    return async_parts[part]
@@ -0,0 +1,245 @@
+"""
+Command line runner for all solutions, usable as 'python -m advent'.
+
+Every module in advent.solutions declares which day it solves (DAY), a dict of solvers for the parts of that day it
+implements (PARTS, mapping part number to a function taking the path to an input file and returning the answer), and
+the path to its puzzle input (INPUT_FILE_PATH). Modules are found through advent.registry, which only imports those
+needed for the requested day - anything else only needed for some of the options is imported when used, too.
+
+Each solver is timed on its own, reading and parsing the input file being part of what it does. That time is split
+into parsing and computing by the phases marked in the solution modules (see advent.instrumentation), measured in a
+second, instrumented run: the share of time spent in parse phases there is taken as the share of parsing. As the
+instrumentation adds some overhead to every call of a marked function, the split is an approximation. Peak memory
+allocated by Python is measured in a third run, so that the tracing overhead does not distort the timings, and the
+instrumented run can optionally be broken down by phase.
+"""
+import argparse
+import os
+import stat
+from contextlib import ExitStack
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, NamedTuple, Optional, Union
+from advent import instrumentation, registry
+from advent.registry import Solution, Solver
+
+
+class RunResult(NamedTuple):
+    day: int
+    part: int
+    answer: Any
+    solve_ns: int
+    parse_ns: int
+    compute_ns: int
+    peak_bytes: Optional[int] = None
+    phases: Optional[dict[str, instrumentation.PhaseStats]] = None
+
+
+def find_solutions() -> dict[tuple[int, int], Solution]:
+    """
+    Import all solution modules and collect the solvers they declare.
+
+    :return: dict mapping (day, part) to Solution
+    """
+    return {(day, part): registry.get_solution(day, part) for day, part in sorted(registry.MODULES)}
+
+
+def spool_input(file_path: Path, exit_stack: ExitStack) -> Path:
+    """
+    Make an input readable more than once: inputs which are not regular files, such as pipes or /dev/stdin, are
+    copied into a temporary file, deleted when exit_stack is closed. Regular files are used as they are.
+
+    :param file_path: path to input file
+    :param exit_stack: exit stack taking care of deleting the temporary file
+    :return: path to a regular file with the same contents
+    """
+    if stat.S_ISREG(os.stat(file_path).st_mode):
+        return file_path
+    import shutil
+    import tempfile
+
+    directory = exit_stack.enter_context(tempfile.TemporaryDirectory())
+    spooled_path = Path(directory, "input.txt")
+    with open(file_path, "rb") as source, open(spooled_path, "wb") as target:
+        shutil.copyfileobj(source, target)
+    return spooled_path
+
+
+def run(
+        solution: Solution,
+        file_path: Union[str, Path],
+        measure_memory: bool = True,
+        measure_phases: bool = False
+) -> RunResult:
+    """
+    Run a solution on the given input file, timing it and splitting the time into parsing and computing.
+
+    :param solution: the solution to run
+    :param file_path: path to input file
+    :param measure_memory: whether to do an additional run, measuring peak memory
+    :param measure_phases: whether to include the breakdown of the solver's time by phase in the result
+    :return: RunResult with the answer and measurements
+    """
+    start = perf_counter_ns()
+    answer = solution.solver(file_path)
+    solve_ns = perf_counter_ns() - start
+
+    with instrumentation.instrumented():
+        start = perf_counter_ns()
+        solution.solver(file_path)
+        instrumented_ns = perf_counter_ns() - start
+    parse_share = min(instrumentation.get_totals().get(instrumentation.PARSE, 0) / max(instrumented_ns, 1), 1)
+    parse_ns = round(solve_ns * parse_share)
+
+    peak_bytes = None
+    if measure_memory:
+        import tracemalloc
+
+        tracemalloc.start()
+        try:
+            solution.solver(file_path)
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return RunResult(
+        day=solution.day,
+        part=solution.part,
+        answer=answer,
+        solve_ns=solve_ns,
+        parse_ns=parse_ns,
+        compute_ns=solve_ns - parse_ns,
+        peak_bytes=peak_bytes,
+        phases=instrumentation.get_stats() if measure_phases else None
+    )
+
+
+def format_duration(nanoseconds: int) -> str:
+    if nanoseconds >= 1_000_000_000:
+        return f"{nanoseconds / 1_000_000_000:.2f} s"
+    if nanoseconds >= 1_000_000:
+        return f"{nanoseconds / 1_000_000:.2f} ms"
+    return f"{nanoseconds / 1_000:.1f} us"
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_result(result: RunResult) -> str:
+    line = (
+        f"day {result.day} part {result.part}: {result.answer}  solve {format_duration(result.solve_ns)} "
+        f"(parse {format_duration(result.parse_ns)}, compute {format_duration(result.compute_ns)})"
+    )
+    if result.peak_bytes is not None:
+        line += f", peak memory {format_size(result.peak_bytes)}"
+    for stats in (result.phases or {}).values():
+        line += (
+            f"\n    {stats.kind:<8} {stats.name:<45} {format_duration(stats.total_ns):>10} total  "
+            f"{format_duration(stats.self_ns):>10} self  {stats.calls:>10} calls  "
+            f"{stats.allocated_blocks:>10} blocks allocated"
+        )
+    return line
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m advent", description="Run Advent of Code solutions.")
+    parser.add_argument("day", type=int, help="day to solve")
+    parser.add_argument("part", type=int, nargs="?", help="part to solve, all parts of the day if omitted")
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=Path,
+        nargs="+",
+        help="input files, the day's puzzle input if omitted - several files are solved in batch mode"
+    )
+    parser.add_argument("--workers", type=int, help="solve in batch mode, using this many worker processes")
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="split each input into chunks solved in parallel (days 1 to 4), --workers sets the number of processes"
+    )
+    parser.add_argument("--no-memory", action="store_true", help="skip measuring peak memory")
+    parser.add_argument("--phases", action="store_true", help="break solve time down by the solver's phases")
+    parser.add_argument("--cache", type=Path, help="directory for caching parsed inputs between runs")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.cache:
+        from advent import cache
+
+        cache.configure(args.cache)
+    selected = [
+        registry.get_solution(args.day, part) for part in registry.parts(args.day)
+        if args.part is None or part == args.part
+    ]
+    if not selected:
+        print(f"no solution found for day {args.day}" + (f" part {args.part}" if args.part else ""))
+        return 1
+    with ExitStack() as exit_stack:
+        # every input is read several times, by the measured runs or by the worker processes
+        if args.input:
+            args.input = [spool_input(file_path, exit_stack) for file_path in args.input]
+        return run_selected(selected, args)
+
+
+def run_selected(selected: list[Solution], args: argparse.Namespace) -> int:
+    if args.chunked:
+        return run_chunked(selected, args.input or [selected[0].default_input], args.workers)
+    if (args.input and len(args.input) > 1) or args.workers:
+        return run_batch(selected, args.input or [selected[0].default_input], args.workers)
+    for solution in selected:
+        file_path = args.input[0] if args.input else solution.default_input
+        result = run(solution, file_path, measure_memory=not args.no_memory, measure_phases=args.phases)
+        print(format_result(result))
+    return 0
+
+
+def run_batch(solutions: list[Solution], file_paths: list[Path], max_workers: Optional[int]) -> int:
+    """
+    Solve every solution on every input file in a pool of worker processes, printing the answers in order.
+
+    :return: exit code, 1 if solving any of the inputs failed
+    """
+    from advent.batch import Job, iter_batch
+
+    jobs = [Job(solution.day, solution.part, file_path) for file_path in file_paths for solution in solutions]
+    start = perf_counter_ns()
+    failures = 0
+    for result in iter_batch(jobs, max_workers):
+        job = result.job
+        if result.ok:
+            print(f"day {job.day} part {job.part} {job.file_path}: {result.answer}")
+        else:
+            failures += 1
+            print(f"day {job.day} part {job.part} {job.file_path}: FAILED {result.error}")
+    duration = perf_counter_ns() - start
+    print(f"solved {len(jobs) - failures} of {len(jobs)} jobs in {format_duration(duration)}")
+    return 1 if failures else 0
+
+
+def run_chunked(solutions: list[Solution], file_paths: list[Path], max_workers: Optional[int]) -> int:
+    """
+    Solve every solution on every input file, each split into chunks solved in a pool of worker processes.
+
+    :return: exit code, 1 if any of the solutions cannot be solved chunk by chunk
+    """
+    from advent import mapreduce
+
+    for solution in solutions:
+        if (solution.day, solution.part) not in mapreduce.TASKS:
+            print(f"day {solution.day} part {solution.part} cannot be solved chunk by chunk")
+            return 1
+    for file_path in file_paths:
+        for solution in solutions:
+            start = perf_counter_ns()
+            answer = mapreduce.solve(solution.day, solution.part, file_path, max_workers)
+            duration = perf_counter_ns() - start
+            print(f"day {solution.day} part {solution.part} {file_path}: {answer}  solve {format_duration(duration)}")
+    return 0
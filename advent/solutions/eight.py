@@ -1,5 +1,8 @@
+from array import array
 from pathlib import Path
+from advent.cache import Arrays, cached_parser
 from advent.common import yield_lines, INPUTS_FOLDER
+from advent.instrumentation import phase, PARSE
 
 
 INPUT_FILE_NAME = "8.txt"
@@ -67,6 +70,29 @@ def highest_scenic_score(file_path: str | Path) -> int:
 
 
 
+def encode_rows_and_cols(rows_and_cols: tuple[list[list[int]], list[list[int]]]) -> Arrays:
+    """
+    Convert parsed grid into arrays for caching - the heights row by row, and the width of the grid.
+    """
+    rows, cols = rows_and_cols
+    heights = bytearray()
+    for row in rows:
+        heights.extend(row)
+    return {"heights": bytes(heights), "width": array("q", [len(cols)])}
+
+
+def decode_rows_and_cols(arrays: Arrays) -> tuple[list[list[int]], list[list[int]]]:
+    heights = arrays["heights"]
+    width = arrays["width"][0]
+    if not width:
+        return [], []
+    rows = [list(heights[i:i + width]) for i in range(0, len(heights), width)]
+    cols = [list(heights[j::width]) for j in range(width)]
+    return rows, cols
+
+
+@phase(PARSE)
+@cached_parser("eight.rows_and_cols.v1", encode=encode_rows_and_cols, decode=decode_rows_and_cols)
 def parse_rows_and_cols(file_path: str | Path) -> tuple[list[list[int]], list[list[int]]]:
     """
     Parse input file into rows and columns.
@@ -92,6 +118,7 @@ def parse_rows_and_cols(file_path: str | Path) -> tuple[list[list[int]], list[li
     return rows, columns
 
 
+@phase()
 def is_visible(
         value: int,
         x_coordinate: int,
@@ -139,6 +166,7 @@ def is_visible(
     return False
 
 
+@phase()
 def scenic_score(
         value: int,
         x_coordinate: int,
@@ -179,6 +207,12 @@ def scenic_score(
     return score_left * score_right * score_top * score_bottom
 
 
+DAY = 8
+PARTS = {
+    1: count_visible,
+    2: highest_scenic_score
+}
+
 
 if __name__ == "__main__":
     print(count_visible(INPUT_FILE_PATH))
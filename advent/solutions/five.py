@@ -1,11 +1,18 @@
+from array import array
+from functools import partial
 from pathlib import Path
-from typing import Union, List
-from advent.common import yield_lines, INPUTS_FOLDER
+from typing import Union, List, Tuple
+from advent.common import MappedInput, select_part, yield_lines, INPUTS_FOLDER
+from advent.instrumentation import phase, PARSE
 import re
 
 INPUT_FILE_NAME = "5.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
 
+# the empty line between the drawing of the stacks and the moves
+SECTION_SEPARATOR_PATTERN = re.compile(rb"\r?\n\r?\n")
+NUMBER_PATTERN = re.compile(rb"[0-9]+")
+
 
 def compute_stack_tops(file_path: Union[str, Path], part_1: bool) -> str:
     """
@@ -40,8 +47,7 @@ def compute_stack_tops(file_path: Union[str, Path], part_1: bool) -> str:
 
     for line in yield_lines(file_path):
         if moves_reached:
-            line_str_numbers: List[str] = re.findall("[0-9]+", line)
-            line_numbers: List[int] = list(map(int, line_str_numbers))
+            line_numbers = parse_move(line)
             if part_1:
                 perform_moves_part1(line_numbers[0], line_numbers[1], line_numbers[2], stacks)
             else:
@@ -66,6 +72,265 @@ def compute_stack_tops(file_path: Union[str, Path], part_1: bool) -> str:
     return "".join(top_letters)
 
 
+def compute_stack_tops_reverse(file_path: Union[str, Path], part_1: bool) -> str:
+    """
+    Alternative solution of the fifth day challenge, which does not move any crates. Instead, the position of the top
+    crate of each stack is traced backwards through the moves, back to where that crate started out.
+
+    This takes O(moves * stacks) time, no matter how many crates each move moves, or how tall the stacks are.
+
+    :param file_path: path to input file
+    :param part_1: bool switch - True for solving part 1, False for solving part 2
+    :return: the letters on top of each stack, after all described moves have been completed
+    """
+    stacks, moves = parse_input(file_path)
+    return trace_stack_tops(stacks, moves, part_1)
+
+
+def compute_stack_tops_bulk(file_path: Union[str, Path], part_1: bool) -> str:
+    """
+    Solve the fifth day challenge like compute_stack_tops, but parsing the whole input file in bulk first,
+    see parse_input.
+
+    :param file_path: path to input file
+    :param part_1: bool switch - True for solving part 1, False for solving part 2
+    :return: the letters on top of each stack, after all described moves have been completed
+    """
+    stacks, moves = parse_input(file_path)
+    return simulate_stack_tops(stacks, moves, part_1)
+
+
+def compute_both_stack_tops(file_path: Union[str, Path]) -> Tuple[str, str]:
+    """
+    Solve both parts of the fifth day challenge, parsing the input file only once.
+
+    :param file_path: path to input file
+    :return: the letters on top of each stack after all moves, for part 1 and for part 2
+    """
+    stacks, moves = parse_input(file_path)
+    return simulate_stack_tops(stacks, moves, True), simulate_stack_tops(stacks, moves, False)
+
+
+@phase(PARSE)
+def parse_input(file_path: Union[str, Path]) -> Tuple[List[List[str]], "array[int]"]:
+    """
+    Parse the whole input file into the initial stacks and the moves, in bulk rather than line by line.
+
+    The numbers of all moves are found by a single scan of a compiled regex over the moves section, and collected
+    into a flat array of integers - count, from stack and to stack of the first move, then of the second, and so on.
+    The regex runs straight over the mapped file, a chunk of lines at a time, so nothing but the (small) drawing is
+    copied, and the numbers found are turned into integers before the next chunk is scanned.
+
+    :param file_path: path to input file
+    :return: stacks as a list of lists of letters, and moves as a flat array of integers
+    """
+    moves = array("q")
+    with MappedInput(file_path) as mapped:
+        separator = SECTION_SEPARATOR_PATTERN.search(mapped.buffer)
+        if separator is None:
+            raise ValueError("missing empty line between the stacks and the moves")
+        with mapped.buffer[:separator.start()] as drawing:
+            stacks = parse_drawing(bytes(drawing).splitlines())
+        for begin, end in mapped.chunks(begin=separator.end()):
+            moves.extend(map(int, NUMBER_PATTERN.findall(mapped.buffer, begin, end)))
+    if len(moves) % 3:
+        raise ValueError("every move must consist of three numbers")
+    return stacks, moves
+
+
+@phase(PARSE)
+def parse_drawing(lines: List[bytes]) -> List[List[str]]:
+    """
+    Parse the drawing of the initial stacks, including the line numbering the stacks, into a list of lists of
+    letters, like convert_to_stacks.
+
+    Rather than picking out the letters one by one, each line is sliced with a stride of 4, giving the letters of
+    all stacks at that height at once. The stacks are then the columns of those rows.
+
+    :param lines: lines of the drawing, as bytes
+    :return: stacks represented as a list of lists
+    """
+    *crate_lines, number_line = lines
+    stack_count = int(number_line.split()[-1])
+    rows = [line[1::4].decode().ljust(stack_count) for line in reversed(crate_lines)]
+    if not rows:
+        return [[] for _ in range(stack_count)]
+    return [list("".join(column).rstrip()) for column in zip(*rows)]
+
+
+@phase()
+def simulate_stack_tops(stacks: List[List[str]], moves: "array[int]", part_1: bool) -> str:
+    """
+    Perform all moves on a copy of the stacks, and return the letters on top of each stack.
+
+    :param stacks: initial stacks, as a list of lists of letters (not modified)
+    :param moves: moves, as a flat array of count, from stack and to stack of each move
+    :param part_1: bool switch - True for solving part 1, False for solving part 2
+    :return: the letters on top of each stack, after all moves have been completed
+    """
+    stacks = [list(stack) for stack in stacks]
+    apply_moves(stacks, moves, part_1)
+    return "".join(stack[-1] for stack in stacks)
+
+
+def apply_moves(stacks: List[List[str]], moves: "array[int]", part_1: bool) -> None:
+    """
+    Perform moves on the stacks, in place.
+
+    :param stacks: stacks, as a list of lists of letters
+    :param moves: moves, as a flat array of count, from stack and to stack of each move
+    :param part_1: bool switch - True for moving crates as in part 1, False for moving them as in part 2
+    :return: None
+    """
+    numbers = iter(moves)
+    for count, from_stack_id, to_stack_id in zip(numbers, numbers, numbers):
+        if from_stack_id == to_stack_id:
+            continue
+        moved_items = take_from_stack(count, stacks[from_stack_id - 1])
+        if part_1:
+            moved_items.reverse()
+        stacks[to_stack_id - 1].extend(moved_items)
+
+
+class CrateHistory:
+    """
+    The states of the stacks over the course of all moves, for looking up the stacks after any number of moves
+    without replaying all moves up to there.
+
+    A checkpoint of the stacks, each stack stored as a string, is kept every checkpoint_interval moves. The state
+    after k moves is restored from the last checkpoint before it, replaying at most checkpoint_interval - 1 moves.
+    A shorter interval makes lookups faster, at the cost of memory for more checkpoints.
+
+    Usage:
+
+        history = CrateHistory.from_file(file_path, part_1=False, checkpoint_interval=500)
+        stacks = history.state_at(12_345)
+    """
+
+    def __init__(
+            self,
+            stacks: List[List[str]],
+            moves: "array[int]",
+            part_1: bool,
+            checkpoint_interval: int = 1000
+    ) -> None:
+        """
+        Perform all moves, recording checkpoints along the way.
+
+        :param stacks: initial stacks, as a list of lists of letters (not modified)
+        :param moves: moves, as a flat array of count, from stack and to stack of each move
+        :param part_1: bool switch - True for moving crates as in part 1, False for moving them as in part 2
+        :param checkpoint_interval: number of moves between checkpoints
+        """
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be at least 1")
+        self.moves = moves
+        self.part_1 = part_1
+        self.checkpoint_interval = checkpoint_interval
+        self.move_count = len(moves) // 3
+        self._checkpoints: List[Tuple[str, ...]] = []
+
+        current = [list(stack) for stack in stacks]
+        for begin in range(0, self.move_count + 1, checkpoint_interval):
+            self._checkpoints.append(tuple("".join(stack) for stack in current))
+            apply_moves(current, moves[3 * begin:3 * (begin + checkpoint_interval)], part_1)
+
+    @classmethod
+    def from_file(cls, file_path: Union[str, Path], part_1: bool, checkpoint_interval: int = 1000) -> "CrateHistory":
+        """
+        Record the history of the stacks described by the given input file.
+
+        :param file_path: path to input file
+        :param part_1: bool switch - True for moving crates as in part 1, False for moving them as in part 2
+        :param checkpoint_interval: number of moves between checkpoints
+        :return: CrateHistory
+        """
+        stacks, moves = parse_input(file_path)
+        return cls(stacks, moves, part_1, checkpoint_interval)
+
+    def state_at(self, move: int) -> List[List[str]]:
+        """
+        Find the stacks after the given number of moves.
+
+        :param move: number of moves made, 0 for the initial stacks
+        :return: stacks as a new list of lists of letters
+        """
+        if not 0 <= move <= self.move_count:
+            raise IndexError(f"move {move} out of range, there are {self.move_count} moves")
+        checkpoint = move // self.checkpoint_interval
+        stacks = [list(stack) for stack in self._checkpoints[checkpoint]]
+        apply_moves(stacks, self.moves[3 * checkpoint * self.checkpoint_interval:3 * move], self.part_1)
+        return stacks
+
+    def tops_at(self, move: int) -> str:
+        """
+        Find the letters on top of each stack after the given number of moves, a space for empty stacks.
+        """
+        return "".join(stack[-1] if stack else " " for stack in self.state_at(move))
+
+
+@phase()
+def trace_stack_tops(stacks: List[List[str]], moves: "array[int]", part_1: bool) -> str:
+    """
+    Find the letters on top of each stack after all moves, by tracing the position of each top crate backwards
+    through the moves, without moving any crates.
+
+    A forward pass only keeps track of the height of each stack, giving the final position of each top crate. Going
+    back through the moves, a position among the crates a move put on a stack is then mapped back to the position
+    the crate had on the stack it was moved from - reversed for part 1, where crates are moved one at a time.
+
+    :param stacks: initial stacks, as a list of lists of letters (not modified)
+    :param moves: moves, as a flat array of count, from stack and to stack of each move
+    :param part_1: bool switch - True for solving part 1, False for solving part 2
+    :return: the letters on top of each stack, after all moves have been completed
+    """
+    heights = [len(stack) for stack in stacks]
+    numbers = iter(moves)
+    for count, from_stack_id, to_stack_id in zip(numbers, numbers, numbers):
+        if from_stack_id == to_stack_id:
+            continue
+        if count > heights[from_stack_id - 1]:
+            raise IndexError(f"cannot move {count} items from a stack of {heights[from_stack_id - 1]}")
+        heights[from_stack_id - 1] -= count
+        heights[to_stack_id - 1] += count
+
+    # the top crate of each stack being traced, as [stack index, position on stack], in the order of the stacks
+    tracked = [[index, height - 1] for index, height in enumerate(heights)]
+    if any(height == 0 for height in heights):
+        raise IndexError("cannot find the top of an empty stack")
+
+    numbers = reversed(moves)
+    for to_stack_id, from_stack_id, count in zip(numbers, numbers, numbers):
+        if from_stack_id == to_stack_id or count == 0:
+            continue
+        from_index = from_stack_id - 1
+        to_index = to_stack_id - 1
+        # heights before the move
+        heights[to_index] -= count
+        heights[from_index] += count
+        moved_begin = heights[to_index]
+        for top in tracked:
+            if top[0] == to_index and top[1] >= moved_begin:
+                offset = top[1] - moved_begin
+                top[0] = from_index
+                top[1] = heights[from_index] - 1 - offset if part_1 else heights[from_index] - count + offset
+
+    return "".join(stacks[stack_index][position] for stack_index, position in tracked)
+
+
+@phase(PARSE)
+def parse_move(line: str) -> List[int]:
+    """
+    Parse a line describing a move, such as 'move 1 from 2 to 1', into its three numbers.
+
+    :param line: line describing a move
+    :return: list of the number of items to move, the stack to move them from, and the stack to move them to
+    """
+    line_str_numbers: List[str] = re.findall("[0-9]+", line)
+    return list(map(int, line_str_numbers))
+
+
+@phase(PARSE)
 def convert_to_stacks(string_representation: List[str], stack_count: int) -> List[List[str]]:
     """
     Given the initial lines of the input file, representing stacks of letters, parse them into a list of lists
@@ -100,10 +365,29 @@ def convert_to_stacks(string_representation: List[str], stack_count: int) -> Lis
     return stacks
 
 
+def take_from_stack(count: int, from_stack: List[str]) -> List[str]:
+    """
+    Remove the given number of items from the top of a stack, in place, and return them in their order on the stack.
+
+    Only the items moved are copied, so this takes O(count) time however tall the stack is.
+
+    :param count: number of items to remove
+    :param from_stack: stack to remove items from
+    :return: removed items, bottom one first
+    """
+    if count > len(from_stack):
+        raise IndexError(f"cannot move {count} items from a stack of {len(from_stack)}")
+    split = len(from_stack) - count
+    moved_items = from_stack[split:]
+    del from_stack[split:]
+    return moved_items
+
+
+@phase()
 def perform_moves_part1(count: int, from_stack_id: int, to_stack_id: int, stacks: List[List[str]]) -> None:
     """
     Perform the moves specified in a line of input. Implements logic for part 1 of the challenge, where
-    items are moved one at a time.
+    items are moved one at a time - which is the same as moving them all at once, in reverse order.
 
     :param count: number of items to move
     :param from_stack_id: which stack to move items from
@@ -111,17 +395,14 @@ def perform_moves_part1(count: int, from_stack_id: int, to_stack_id: int, stacks
     :param stacks:
     :return: None
     """
-    from_index = from_stack_id - 1
-    to_index = to_stack_id - 1
-
-    from_stack = stacks[from_index]
-    to_stack = stacks[to_index]
-
-    for _ in range(count):
-        moved_item = from_stack.pop()
-        to_stack.append(moved_item)
+    if from_stack_id == to_stack_id:
+        return
+    moved_items = take_from_stack(count, stacks[from_stack_id - 1])
+    moved_items.reverse()
+    stacks[to_stack_id - 1].extend(moved_items)
 
 
+@phase()
 def perform_move_part2(count: int, from_stack_id: int, to_stack_id: int, stacks: List[List[str]]) -> None:
     """
     Perform the moves specified in a line of input. Implements logic for part 2 of the challenge, where
@@ -133,16 +414,29 @@ def perform_move_part2(count: int, from_stack_id: int, to_stack_id: int, stacks:
     :param stacks:
     :return: None
     """
-    from_index = from_stack_id - 1
-    to_index = to_stack_id - 1
-    from_stack = stacks[from_index]
-    to_stack = stacks[to_index]
-
-    moved_items = from_stack[-count:]
-    to_stack.extend(moved_items)
-    # here, we must use 'stacks[from_index]' on the left side of the assignment, rather than
-    # 'from_stack', otherwise the original list (stacks) will not be modified
-    stacks[from_index] = from_stack[:-count]
+    if from_stack_id == to_stack_id:
+        return
+    moved_items = take_from_stack(count, stacks[from_stack_id - 1])
+    stacks[to_stack_id - 1].extend(moved_items)
+
+
+DAY = 5
+PARTS = {
+    1: partial(compute_stack_tops_bulk, part_1=True),
+    2: partial(compute_stack_tops_bulk, part_1=False)
+}
+ALTERNATIVE_PARTS = {
+    1: {
+        "per-line": partial(compute_stack_tops, part_1=True),
+        "reverse-trace": partial(compute_stack_tops_reverse, part_1=True),
+        "single-pass": partial(select_part, compute_both_stack_tops, 1)
+    },
+    2: {
+        "per-line": partial(compute_stack_tops, part_1=False),
+        "reverse-trace": partial(compute_stack_tops_reverse, part_1=False),
+        "single-pass": partial(select_part, compute_both_stack_tops, 2)
+    }
+}
 
 
 if __name__ == "__main__":
@@ -1,10 +1,23 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from functools import partial
 from pathlib import Path
-from typing import Union, NamedTuple, Tuple
-from advent.common import yield_lines, INPUTS_FOLDER
+from typing import TYPE_CHECKING, Callable, Generator, Iterable, Iterator, Union, NamedTuple, Tuple
+from advent.common import MappedInput, async_yield_lines, import_numpy, numpy_available, yield_lines, INPUTS_FOLDER
+from advent.instrumentation import phase, PARSE
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader
+    from numpy import ndarray
 
 INPUT_FILE_NAME = "4.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
 
+# the separators between the four numbers of a line, by byte value
+SEPARATORS_AFTER = (ord("-"), ord(","), ord("-"))
+# largest number of digits whose value still fits into an int64
+MAX_DIGITS = 18
+
 
 class Range(NamedTuple):
     begin: int
@@ -25,8 +38,7 @@ def count_containments(file_path: Union[str, Path]) -> int:
 
     for line in yield_lines(file_path):
         range_1, range_2 = parse_ranges_line(line)
-        if (range_1.begin <= range_2.begin and range_1.end >= range_2.end) or \
-                (range_2.begin <= range_1.begin and range_2.end >= range_1.end):
+        if one_contains_other(range_1, range_2):
             containment_count += 1
 
     return containment_count
@@ -45,15 +57,52 @@ def count_overlaps(file_path: Union[str, Path]) -> int:
 
     for line in yield_lines(file_path):
         range_1, range_2 = parse_ranges_line(line)
-        if (range_2.begin <= range_1.begin <= range_2.end) or \
-                (range_2.begin <= range_1.end <= range_2.end) or \
-                (range_1.begin <= range_2.begin <= range_1.end) or \
-                (range_1.begin <= range_2.end <= range_1.end):
+        if ranges_overlap(range_1, range_2):
             overlap_count += 1
 
     return overlap_count
 
 
+async def count_matching_pairs_async(reader: "StreamReader", predicate: Callable[[Range, Range], bool]) -> int:
+    """
+    Solve either part of the fourth day challenge, reading the input from a stream as it arrives.
+
+    :param reader: stream to read input from
+    :param predicate: condition the pair of ranges on a line has to meet to be counted, one_contains_other for
+        part 1, ranges_overlap for part 2
+    :return: count of lines where the ranges meet the condition
+    """
+    count = 0
+
+    async for line in async_yield_lines(reader):
+        range_1, range_2 = parse_ranges_line(line)
+        if predicate(range_1, range_2):
+            count += 1
+
+    return count
+
+
+@phase()
+def one_contains_other(range_1: Range, range_2: Range) -> bool:
+    """
+    Check whether either of two ranges fully contains the other one.
+    """
+    return (range_1.begin <= range_2.begin and range_1.end >= range_2.end) or \
+        (range_2.begin <= range_1.begin and range_2.end >= range_1.end)
+
+
+@phase()
+def ranges_overlap(range_1: Range, range_2: Range) -> bool:
+    """
+    Check whether two ranges have at least one section in common.
+    """
+    return (range_2.begin <= range_1.begin <= range_2.end) or \
+        (range_2.begin <= range_1.end <= range_2.end) or \
+        (range_1.begin <= range_2.begin <= range_1.end) or \
+        (range_1.begin <= range_2.end <= range_1.end)
+
+
+@phase(PARSE)
 def parse_ranges_line(line: str) -> Tuple[Range, Range]:
     """
     Parse string of format '7-91, 12-91', representing two ranges, into two Ranges.
@@ -68,6 +117,7 @@ def parse_ranges_line(line: str) -> Tuple[Range, Range]:
     return range_1, range_2
 
 
+@phase(PARSE)
 def parse_single_range(range_string: str) -> Range:
     """
     Parse string in format '7-91', representing a range, into a Range.
@@ -79,6 +129,324 @@ def parse_single_range(range_string: str) -> Range:
     return Range(int(begin_range), int(end_range))
 
 
+def parse_ranges_numpy(file_path: Union[str, Path]) -> "ndarray":
+    """
+    Parse the whole input file at once into an array with one row per line, holding the begin and end of the first
+    range and the begin and end of the second range. Needs numpy.
+
+    :param file_path: path to input file
+    :return: int64 array of shape (number of lines, 4)
+    """
+    with MappedInput(file_path) as mapped:
+        return parse_ranges_buffer(mapped.buffer)
+
+
+@phase(PARSE)
+def parse_ranges_buffer(buffer: bytes | memoryview) -> "ndarray":
+    """
+    Parse lines of ranges into an array of shape (number of lines, 4), see parse_ranges_numpy.
+
+    The bytes are viewed as an array without copying them. Numbers are found as runs of digits, and their values
+    summed from their last digits, second to last digits and so on, each weighted by its power of ten. Every line is
+    checked to consist of exactly four numbers separated by '-', ',' and '-', and ended by '\n' or '\r\n' (except
+    possibly the last one) - nothing is skipped.
+
+    :raises ValueError: if a line is not in the format '2-4,6-8'
+    """
+    np = import_numpy()
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if not len(data):
+        return np.empty((0, 4), dtype=np.int64)
+    is_digit = (data >= ord("0")) & (data <= ord("9"))
+    edges = np.diff(is_digit.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+    # numbers are data[starts[i]:ends[i]]
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    lengths = ends - starts
+    if len(starts) == 0 or len(starts) % 4 or starts[0] != 0 or lengths.max() > MAX_DIGITS:
+        raise ValueError("every line must contain two ranges")
+    tail = bytes(data[ends[-1]:])
+    if tail not in (b"", b"\n", b"\r\n"):
+        raise ValueError("every line must contain two ranges")
+    lines_starts = starts.reshape(-1, 4)
+    lines_ends = ends.reshape(-1, 4)
+    # within a line, a single '-', ',' and '-' between the numbers
+    separators = data[lines_ends[:, :3]]
+    valid = (lines_starts[:, 1:] - lines_ends[:, :3] == 1).all() and (separators == SEPARATORS_AFTER).all()
+    # between lines, '\n' or '\r\n'
+    line_ends = lines_ends[:-1, 3]
+    gaps = lines_starts[1:, 0] - line_ends
+    first_bytes = data[line_ends]
+    valid = valid and (
+        ((gaps == 1) & (first_bytes == ord("\n")))
+        | ((gaps == 2) & (first_bytes == ord("\r")) & (data[line_ends + 1] == ord("\n")))
+    ).all()
+    if not valid:
+        raise ValueError("every line must contain two ranges")
+
+    numbers = np.zeros(len(starts), dtype=np.int64)
+    # add up the k-th last digit of all numbers at once, for each k up to the length of the longest number
+    for k in range(int(lengths.max())):
+        digits = data[ends - 1 - k].astype(np.int64) - ord("0")
+        numbers += np.where(lengths > k, digits, 0) * 10 ** k
+    return numbers.reshape(-1, 4)
+
+
+def count_matching_pairs_numpy(ranges: "ndarray") -> Tuple[int, int]:
+    """
+    Count the pairs of ranges where one contains the other, and where they overlap, with vectorized comparisons
+    of the columns of the array of ranges.
+
+    :param ranges: array of shape (number of pairs, 4), as returned by parse_ranges_numpy
+    :return: count of pairs where one range contains the other, and count of pairs where the ranges overlap
+    """
+    begin_1, end_1, begin_2, end_2 = ranges.T
+    containments = ((begin_1 <= begin_2) & (end_1 >= end_2)) | ((begin_2 <= begin_1) & (end_2 >= end_1))
+    # for ranges with begin <= end, this is equivalent to the four checks of ranges_overlap
+    overlaps = (begin_1 <= end_2) & (begin_2 <= end_1)
+    return int(containments.sum()), int(overlaps.sum())
+
+
+def count_containments_and_overlaps_numpy(file_path: Union[str, Path], chunk_size: int = 1 << 24) -> Tuple[int, int]:
+    """
+    Vectorized solution of both parts of the fourth day challenge in a single pass over the input, which needs numpy.
+
+    The file is parsed chunk by chunk, so that memory use stays bounded however large it is.
+
+    :param file_path: path to input file
+    :param chunk_size: approximate size of each chunk in bytes
+    :return: count of lines where one range fully contains another, and count of lines where the ranges overlap
+    """
+    containment_count = 0
+    overlap_count = 0
+    with MappedInput(file_path) as mapped:
+        for begin, end in mapped.chunks(chunk_size):
+            with mapped.buffer[begin:end] as chunk:
+                ranges = parse_ranges_buffer(chunk)
+            chunk_containments, chunk_overlaps = count_matching_pairs_numpy(ranges)
+            containment_count += chunk_containments
+            overlap_count += chunk_overlaps
+    return containment_count, overlap_count
+
+
+def count_containments_numpy(file_path: Union[str, Path]) -> int:
+    return count_containments_and_overlaps_numpy(file_path)[0]
+
+
+def count_overlaps_numpy(file_path: Union[str, Path]) -> int:
+    return count_containments_and_overlaps_numpy(file_path)[1]
+
+
+def yield_all_ranges(file_path: Union[str, Path]) -> Generator[Range, None, None]:
+    """
+    Generator yielding all ranges in the given input file, both ranges of every line.
+
+    :param file_path: path to input file
+    """
+    for line in yield_lines(file_path):
+        yield from parse_ranges_line(line)
+
+
+def count_containing_and_overlapping_pairs(ranges: Iterable[Range]) -> Tuple[int, int]:
+    """
+    Count the pairs of ranges where one contains the other, and the pairs of ranges which overlap, among all the
+    given ranges rather than just the two ranges on each line, in O(n log n) time rather than comparing every pair.
+
+    Overlapping pairs are all pairs, less those where one range ends before the other begins, which are counted
+    sweeping over the sorted begins and ends. For containing pairs, ranges are swept in order of begin (and of
+    descending end, for equal begins), so that every range contains those ranges after it which do not end later -
+    a Fenwick tree over the ends of the ranges swept so far counts those for each range.
+
+    :param ranges: ranges to count pairs among
+    :return: count of pairs where one range contains the other, and count of pairs of ranges which overlap
+    """
+    ranges = sorted(ranges, key=lambda range_: (range_.begin, -range_.end))
+    ends = sorted(range_.end for range_ in ranges)
+
+    disjoint_count = 0
+    ended = 0
+    for range_ in ranges:
+        while ends[ended] < range_.begin:
+            ended += 1
+        disjoint_count += ended
+    overlapping_count = len(ranges) * (len(ranges) - 1) // 2 - disjoint_count
+
+    end_ranks = {end: rank for rank, end in enumerate(sorted(set(ends)), 1)}
+    tree = [0] * (len(end_ranks) + 1)
+    containing_count = 0
+    for swept, range_ in enumerate(ranges):
+        rank = end_ranks[range_.end]
+        # ranges swept so far begin no later than this one, those ending before it does not contain it
+        ending_before = 0
+        node = rank - 1
+        while node:
+            ending_before += tree[node]
+            node &= node - 1
+        containing_count += swept - ending_before
+        node = rank
+        while node < len(tree):
+            tree[node] += 1
+            node += node & -node
+
+    return containing_count, overlapping_count
+
+
+def yield_overlapping_pairs(
+        ranges: Iterable[Range],
+        containing_only: bool = False
+) -> Generator[Tuple[Range, Range], None, None]:
+    """
+    Generator yielding all pairs of overlapping ranges among the given ranges, as soon as each is found.
+
+    Ranges are swept in order of begin (and of descending end, for equal begins), keeping a heap of those not yet
+    ended, each of which overlaps the range being swept. The first range of each pair is the one swept earlier.
+
+    :param ranges: ranges to find pairs among
+    :param containing_only: only yield pairs where the first range contains the second one
+    """
+    active: list[Tuple[int, int, Range]] = []
+    for swept, range_ in enumerate(sorted(ranges, key=lambda range_: (range_.begin, -range_.end))):
+        while active and active[0][0] < range_.begin:
+            heapq.heappop(active)
+        for end, _, other in active:
+            if not containing_only or end >= range_.end:
+                yield other, range_
+        heapq.heappush(active, (range_.end, swept, range_))
+
+
+def find_overlapping_pairs(
+        ranges: Iterable[Range],
+        containing_only: bool = False,
+        stream: bool = False
+) -> Union[list[Tuple[Range, Range]], Iterator[Tuple[Range, Range]]]:
+    """
+    Find all pairs of overlapping ranges among the given ranges, see yield_overlapping_pairs.
+
+    :param ranges: ranges to find pairs among
+    :param containing_only: only find pairs where the first range contains the second one
+    :param stream: return an iterator yielding the pairs as they are found, rather than a list
+    :return: list or iterator of pairs of Ranges
+    """
+    pairs = yield_overlapping_pairs(ranges, containing_only)
+    return pairs if stream else list(pairs)
+
+
+class IntervalIndex:
+    """
+    Index of all the ranges in an input file (both ranges on every line), for queries about the whole set of
+    assignments rather than about the two ranges on a single line.
+
+    Counting queries take logarithmic time, by binary search in the begins and in the ends of all ranges, each
+    sorted separately. Listing the ranges overlapping a query range takes logarithmic time per range found, using
+    an implicit binary tree over the ranges sorted by begin, in which every node holds the largest end below it.
+    """
+
+    def __init__(self, ranges: Iterable[Range]) -> None:
+        self.ranges = sorted(ranges)
+        self.begins = [range_.begin for range_ in self.ranges]
+        self.ends = sorted(range_.end for range_ in self.ranges)
+        self._size = 1
+        while self._size < len(self.ranges):
+            self._size <<= 1
+        self._max_ends = [float("-inf")] * (2 * self._size)
+        self._max_ends[self._size:self._size + len(self.ranges)] = [range_.end for range_ in self.ranges]
+        for node in range(self._size - 1, 0, -1):
+            self._max_ends[node] = max(self._max_ends[2 * node], self._max_ends[2 * node + 1])
+        self.max_depth = self._find_max_depth()
+
+    @classmethod
+    def from_file(cls, file_path: Union[str, Path]) -> "IntervalIndex":
+        """
+        Build the index of all ranges in the given input file.
+
+        :param file_path: path to input file
+        :return: IntervalIndex
+        """
+        return cls(yield_all_ranges(file_path))
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def _find_max_depth(self) -> int:
+        """
+        Find the largest number of ranges containing the same section, sweeping over the sorted begins and ends.
+        """
+        max_depth = 0
+        ended = 0
+        for started, begin in enumerate(self.begins, 1):
+            while self.ends[ended] < begin:
+                ended += 1
+            max_depth = max(max_depth, started - ended)
+        return max_depth
+
+    def count_containing(self, point: int) -> int:
+        """
+        Count the ranges containing the given section.
+        """
+        return bisect_right(self.begins, point) - bisect_left(self.ends, point)
+
+    def count_overlapping(self, begin: int, end: int) -> int:
+        """
+        Count the ranges having at least one section in common with the range from begin to end.
+        """
+        return bisect_right(self.begins, end) - bisect_left(self.ends, begin)
+
+    def find_overlapping(self, begin: int, end: int) -> list[Range]:
+        """
+        Find the ranges having at least one section in common with the range from begin to end.
+
+        :param begin: first section of the query range
+        :param end: last section of the query range
+        :return: overlapping Ranges, sorted
+        """
+        # only ranges beginning no later than the query range ends can overlap it
+        limit = bisect_right(self.begins, end)
+        found = []
+        stack = [(1, 0, self._size)] if limit else []
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or self._max_ends[node] < begin:
+                continue
+            if node >= self._size:
+                found.append(self.ranges[low])
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return found
+
+    def count_containing_many(self, points: Iterable[int]) -> list[int]:
+        """
+        Count the ranges containing each of the given sections.
+        """
+        begins, ends = self.begins, self.ends
+        return [bisect_right(begins, point) - bisect_left(ends, point) for point in points]
+
+    def count_overlapping_many(self, queries: Iterable[Range]) -> list[int]:
+        """
+        Count the ranges overlapping each of the given query ranges.
+        """
+        begins, ends = self.begins, self.ends
+        return [bisect_right(begins, end) - bisect_left(ends, begin) for begin, end in queries]
+
+
+DAY = 4
+PARTS = {
+    1: count_containments,
+    2: count_overlaps
+}
+ASYNC_PARTS = {
+    1: partial(count_matching_pairs_async, predicate=one_contains_other),
+    2: partial(count_matching_pairs_async, predicate=ranges_overlap)
+}
+ALTERNATIVE_PARTS = {}
+if numpy_available():
+    ALTERNATIVE_PARTS = {
+        1: {"numpy": count_containments_numpy},
+        2: {"numpy": count_overlaps_numpy}
+    }
+
+
 if __name__ == "__main__":
     print(count_containments(INPUT_FILE_PATH))
     print(count_overlaps(INPUT_FILE_PATH))
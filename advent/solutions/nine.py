@@ -1,7 +1,11 @@
 from pathlib import Path
-from advent.common import yield_lines, INPUTS_FOLDER, TEST_INPUTS_FOLDER
+from advent.common import async_yield_lines, yield_lines, INPUTS_FOLDER, TEST_INPUTS_FOLDER
+from advent.instrumentation import phase, PARSE
 from enum import Enum
-from typing import Union
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader
 
 
 INPUT_FILE_NAME = "9.txt"
@@ -51,9 +55,11 @@ class Rope:
     head: Head
     tail: Tail
 
-    def __init__(self, head: Head = Head(), tail: Tail = Tail()) -> None:
-        self.head = head
-        self.tail = tail
+    def __init__(self, head: Head | None = None, tail: Tail | None = None) -> None:
+        # default arguments are evaluated only once, so fresh knots must be created here, otherwise every Rope
+        # would share (and keep moving) the same head and tail
+        self.head = head or Head()
+        self.tail = tail or Tail()
 
     @property
     def y_diff(self):
@@ -87,6 +93,7 @@ class Rope:
             print(f"head position: ({self.head.x_pos}, {self.head.y_pos})")
             print(f"tail position: ({self.tail.x_pos}, {self.tail.y_pos}")
 
+    @phase()
     def alt_process_move(self, direction: Direction, count: int) -> None:
         for i in range(count):
             if direction == Direction.RIGHT:
@@ -192,6 +199,7 @@ class LongRope:
                 if not silent:
                     print(f"after {direction} move #{_}, knot #{i} has position ({self.knots[i].x_pos}, {self.knots[i].y_pos})")
 
+    @phase()
     def alt_process_move(self, direction: Direction, count: int):
         for _ in range(count):
             for i in range(len(self.knots)):
@@ -251,10 +259,7 @@ def count_visited_positions(file_path: Union[str, Path]) -> int:
     """
     rope = Rope()
     for line in yield_lines(file_path):
-        line = line.strip()
-        move_direction, move_count = line.split(" ")
-        move_direction = Direction(move_direction)
-        move_count = int(move_count)
+        move_direction, move_count = parse_move(line)
         rope.alt_process_move(move_direction, move_count)
 
     return len(rope.tail.visited_pos)
@@ -271,16 +276,65 @@ def count_visited_positions_long_rope(file_path: Union[str, Path]) -> int:
     :return: count of unique squares the tail of the rope visited at least once
     """
     rope = LongRope(10)
-    for line_count, line in enumerate(yield_lines(file_path)):
-        line = line.strip()
-        move_direction, move_count = line.split(" ")
-        move_direction = Direction(move_direction)
-        move_count = int(move_count)
+    for line in yield_lines(file_path):
+        move_direction, move_count = parse_move(line)
+        rope.alt_process_move(move_direction, move_count)
+
+    return len(rope.knots[-1].visited_pos)
+
+
+async def count_visited_positions_async(reader: "StreamReader") -> int:
+    """
+    Simulate the two knot rope of the first part of the ninth day challenge while the moves arrive on a stream,
+    applying each move as soon as its line is complete.
+
+    :param reader: stream to read moves from
+    :return: count of unique squares the tail of the rope visited at least once
+    """
+    rope = Rope()
+    async for line in async_yield_lines(reader):
+        move_direction, move_count = parse_move(line)
+        rope.alt_process_move(move_direction, move_count)
+
+    return len(rope.tail.visited_pos)
+
+
+async def count_visited_positions_long_rope_async(reader: "StreamReader") -> int:
+    """
+    Simulate the ten knot rope of the second part of the ninth day challenge while the moves arrive on a stream,
+    applying each move as soon as its line is complete.
+
+    :param reader: stream to read moves from
+    :return: count of unique squares the tail of the rope visited at least once
+    """
+    rope = LongRope(10)
+    async for line in async_yield_lines(reader):
+        move_direction, move_count = parse_move(line)
         rope.alt_process_move(move_direction, move_count)
 
     return len(rope.knots[-1].visited_pos)
 
 
+@phase(PARSE)
+def parse_move(line: str) -> tuple[Direction, int]:
+    """
+    Parse a line in format 'R 4' into the direction and the number of steps of the move.
+    """
+    move_direction, move_count = line.strip().split(" ")
+    return Direction(move_direction), int(move_count)
+
+
+DAY = 9
+PARTS = {
+    1: count_visited_positions,
+    2: count_visited_positions_long_rope
+}
+ASYNC_PARTS = {
+    1: count_visited_positions_async,
+    2: count_visited_positions_long_rope_async
+}
+
+
 if __name__ == "__main__":
     print(count_visited_positions_long_rope(TEST_INPUT_FILE_PATH))
     print(count_visited_positions_long_rope(INPUT_FILE_PATH))
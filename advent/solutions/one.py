@@ -1,6 +1,16 @@
-from typing import Union
+import heapq
+import io
+import os
+from functools import partial
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
 from pathlib import Path
-from advent.common import yield_lines, INPUTS_FOLDER
+from advent.common import ENCODING, MappedInput, async_yield_line_batches, import_numpy, numpy_available, \
+    yield_line_batches, INPUTS_FOLDER
+from advent.instrumentation import phase, PARSE
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader
+    from numpy import ndarray
 
 
 INPUT_FILE_NAME = "1.txt"
@@ -12,24 +22,13 @@ def find_max_calories(file_path: Union[Path, str]) -> int:
     Function which solves part 1 of the first day challenge on Advent of Code.
 
     Given a text file, where each line is either an integer, or an empty line (only '\n'), find the largest sum of
-    a series of consecutive integers uninterrupted by a new line.
+    a series of consecutive integers uninterrupted by a new line. The last series counts even if the file does not
+    end with an empty line.
 
     :param file_path: path to input file
     :return: int, the largest sum of uninterrupted integers
     """
-    maximum = 0
-    current_total = 0
-
-    for line in yield_lines(file_path):
-        stripped_line = line.strip()
-        if stripped_line:
-            current_total += int(stripped_line)
-        else:
-            if current_total > maximum:
-                maximum = current_total
-            current_total = 0
-
-    return maximum
+    return find_top_k_calories(file_path, 1)
 
 
 def find_top_three_calories(file_path: Union[str, Path]) -> int:
@@ -43,25 +42,397 @@ def find_top_three_calories(file_path: Union[str, Path]) -> int:
     :param file_path: path to input file
     :return: int, sum of the three largest sums
     """
-    top_three = [0, 0, 0]
+    return find_top_k_calories(file_path, 3)
+
+
+def find_top_k_calories(file_path: Union[str, Path], k: int) -> int:
+    """
+    Generalization of both parts of the first day challenge: find the sum of the k largest uninterrupted sums.
+
+    Only the k largest sums seen so far are kept, in a min-heap, so that each further sum is compared against the
+    smallest of them and replaces it if larger - O(n log k) time and O(k) memory for n sums. For k=1 the heap is
+    just the largest sum. Being the default solver, the lines are summed and the heap updated in a single loop,
+    rather than going through yield_calorie_totals and _keep_largest, which cost a generator step or a call each.
+
+    :param file_path: path to input file
+    :param k: number of largest sums to add up
+    :return: int, sum of the k largest sums (of all of them, if there are fewer than k)
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    top_totals: list[int] = []
     current_total = 0
+    in_series = False
+
+    for lines in read_line_batches(file_path):
+        for line in lines:
+            stripped_line = line.strip()
+            if stripped_line:
+                current_total += int(stripped_line)
+                in_series = True
+            elif in_series:
+                if k == 1:
+                    if not top_totals:
+                        top_totals.append(current_total)
+                    elif current_total > top_totals[0]:
+                        top_totals[0] = current_total
+                elif len(top_totals) < k:
+                    heapq.heappush(top_totals, current_total)
+                elif current_total > top_totals[0]:
+                    heapq.heapreplace(top_totals, current_total)
+                current_total = 0
+                in_series = False
+
+    if in_series:
+        _keep_largest(top_totals, current_total, k)
+    return sum(top_totals)
+
+
+@phase(PARSE)
+def read_line_batches(file_path: Union[str, Path]) -> Iterator[Iterator[str]]:
+    """
+    Generator reading and decoding the input chunk by chunk, see yield_line_batches - marked as the parse phase of
+    the default solver, whose loop over the lines is not split any further.
+    """
+    yield from yield_line_batches(file_path)
+
+
+@phase(PARSE)
+def yield_calorie_totals(lines: Iterable[str]) -> Iterator[int]:
+    """
+    Generator yielding the sum of each series of consecutive integers in the given lines, including the last series
+    even if it is not followed by an empty line.
+
+    :param lines: lines which are either an integer or empty
+    """
+    series = CalorieSeries()
+    yield from series.add_lines(lines)
+    total = series.end_series()
+    if total is not None:
+        yield total
+
+
+class CalorieSeries:
+    """
+    The series of consecutive integers being summed while reading lines, shared by all solvers going through the
+    input line by line - whether read from a file, from a stream, or appended to a log over time.
+
+    Lines are added in batches (rather than one at a time, which would cost a method call per line), a series
+    still unfinished at the end of a batch carries over to the next one.
+    """
+    __slots__ = ("total", "in_series")
+
+    def __init__(self, total: int = 0, in_series: bool = False) -> None:
+        self.total = total
+        self.in_series = in_series
+
+    def add_lines(self, lines: Iterable[str]) -> Iterator[int]:
+        """
+        Generator adding lines to the series, yielding the sum of every series finished by an empty line.
+
+        :param lines: lines which are either an integer or empty
+        """
+        current_total = self.total
+        in_series = self.in_series
+        try:
+            for line in lines:
+                stripped_line = line.strip()
+                if stripped_line:
+                    current_total += int(stripped_line)
+                    in_series = True
+                elif in_series:
+                    finished_total = current_total
+                    current_total = 0
+                    in_series = False
+                    yield finished_total
+        finally:
+            self.total = current_total
+            self.in_series = in_series
+
+    def end_series(self) -> Optional[int]:
+        """
+        Finish the current series, once no more lines belong to it.
+
+        :return: sum of the series, None if no series was started
+        """
+        if not self.in_series:
+            return None
+        total = self.total
+        self.total = 0
+        self.in_series = False
+        return total
+
+
+def find_top_k_calories_numpy(file_path: Union[str, Path], k: int, chunk_size: int = 1 << 22) -> int:
+    """
+    Vectorized version of find_top_k_calories, which needs numpy.
+
+    The file is processed in chunks ending on empty lines (with the file's line terminator, '\n' or '\r\n'), so that
+    no series is split between chunks. The sums of each chunk are computed by calorie_totals_numpy, and only the k
+    largest sums seen so far are kept.
+
+    :param file_path: path to input file
+    :param k: number of largest sums to add up
+    :param chunk_size: approximate size of each chunk in bytes, bounding the memory used by the intermediate arrays
+    :return: int, sum of the k largest sums (of all of them, if there are fewer than k)
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    np = import_numpy()
+    top_totals = np.empty(0, dtype=np.int64)
+
+    with MappedInput(file_path) as mapped:
+        for begin, end in mapped.chunks(chunk_size, separator=mapped.line_terminator() * 2):
+            with mapped.buffer[begin:end] as chunk:
+                totals = np.concatenate((top_totals, calorie_totals_numpy(chunk)))
+            top_totals = totals if len(totals) <= k else np.partition(totals, len(totals) - k)[-k:]
+
+    return int(top_totals.sum())
+
+
+def calorie_totals_numpy(buffer: bytes | memoryview) -> "ndarray":
+    """
+    Parse the sums of all series of consecutive integers in a buffer at once, as an array.
+
+    Rather than converting each line with int(), the value of every line is accumulated digit position by digit
+    position: the last digits of all lines, times one, plus the second to last digits, times ten, and so on, up to
+    the length of the longest line. Sums of series then follow from differences of the cumulative sum of line values,
+    taken at the empty lines separating them. The only Python-level loop is over digit positions. As in
+    yield_calorie_totals, series containing no lines are skipped.
+
+    :param buffer: contents of an input file, or a part of it starting and ending on a series boundary
+    :return: int64 array of the sums of all series, in order
+    """
+    np = import_numpy()
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if len(data) and data[-1] != ord("\n"):
+        data = np.append(data, np.uint8(ord("\n")))
+    line_ends = np.flatnonzero(data == ord("\n"))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    # leave out the '\r' of '\r\n' line endings
+    line_ends -= (line_ends > line_starts) & (data[line_ends - 1] == ord("\r"))
+    line_lengths = line_ends - line_starts
+
+    width = int(line_lengths.max(initial=0))
+    if width > 18:
+        raise ValueError("numbers of more than 18 digits do not fit into 64 bits")
+    line_values = np.zeros(len(line_ends), dtype=np.int64)
+    for position in range(1, width + 1):
+        # positions before the start of a line are masked out, the indices only need to stay within data
+        digits = data[np.maximum(line_ends - position, 0)] - np.uint8(ord("0"))
+        digits *= line_lengths >= position
+        line_values += digits * np.int64(10 ** (position - 1))
+
+    separators = np.flatnonzero(line_lengths == 0)
+    line_value_sums = np.concatenate(([0], np.cumsum(line_values)))
+    series_starts = np.concatenate(([0], separators + 1))
+    series_ends = np.concatenate((separators, [len(line_ends)]))
+    not_empty = series_ends > series_starts
+    return line_value_sums[series_ends[not_empty]] - line_value_sums[series_starts[not_empty]]
+
+
+async def find_top_k_calories_async(reader: "StreamReader", k: int = 1) -> int:
+    """
+    Solve either part of the first day challenge while the input is still arriving on a stream: the lines of each
+    chunk are summed as soon as it is read, and a series split between chunks is carried over to the next one, so
+    neither the input nor the sums of all series are ever held in memory.
+
+    :param reader: stream to read input from
+    :param k: number of largest sums to add up, 1 for part 1, 3 for part 2
+    :return: sum of the k largest sums
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    top_totals: list[int] = []
+    series = CalorieSeries()
+
+    async for lines in async_yield_line_batches(reader):
+        for total in series.add_lines(lines):
+            _keep_largest(top_totals, total, k)
+
+    total = series.end_series()
+    if total is not None:
+        _keep_largest(top_totals, total, k)
+    return sum(top_totals)
+
+
+@phase()
+def _keep_largest(heap: list[int], total: int, count: int) -> None:
+    """
+    Push total onto a min-heap of at most count of the largest totals, replacing the smallest one if it is full.
+    """
+    if len(heap) < count:
+        heapq.heappush(heap, total)
+    elif total > heap[0]:
+        heapq.heapreplace(heap, total)
+
+
+class CalorieTracker:
+    """
+    Incrementally updated k largest sums of an append-only calorie log, which can be fed lines, whole series, or the
+    part of a log file appended since it was last read.
+
+    Adding a series takes O(log k), max_calories and top_sum are answered in O(1). A series still being added to
+    (not yet followed by an empty line) is not counted until it is finished, by an empty line or by end_series().
+
+    The state can be checkpointed with to_dict() or save(), and resumed with from_dict() or load().
+
+    Usage:
+
+        tracker = CalorieTracker(k=3)
+        tracker.ingest_file(log_path)
+        ...  # more lines get appended to the log
+        tracker.ingest_file(log_path)
+        print(tracker.max_calories, tracker.top_sum)
+    """
+    k: int
+    offset: int
+    series_count: int
+
+    def __init__(self, k: int = 3) -> None:
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        # byte offset in the log file up to which it has been ingested
+        self.offset = 0
+        self.series_count = 0
+        self._top: list[int] = []
+        self._top_sum = 0
+        self._max = 0
+        self._series = CalorieSeries()
+
+    @property
+    def max_calories(self) -> int:
+        """
+        The largest sum of all finished series, 0 if there are none.
+        """
+        return self._max
+
+    @property
+    def top_sum(self) -> int:
+        """
+        Sum of the k largest sums of all finished series (of all of them, if there are fewer than k).
+        """
+        return self._top_sum
+
+    def top(self) -> list[int]:
+        """
+        The k largest sums of all finished series, largest first.
+        """
+        return sorted(self._top, reverse=True)
+
+    def add_series(self, total: int) -> None:
+        """
+        Add the sum of a finished series.
+        """
+        self.series_count += 1
+        if total > self._max:
+            self._max = total
+        if len(self._top) < self.k:
+            heapq.heappush(self._top, total)
+            self._top_sum += total
+        elif total > self._top[0]:
+            self._top_sum += total - heapq.heapreplace(self._top, total)
+
+    def add_line(self, line: str) -> None:
+        """
+        Add a single line of the log, either an integer or an empty line finishing the current series.
+        """
+        self.add_lines((line,))
+
+    def add_lines(self, lines: Iterable[str]) -> None:
+        for total in self._series.add_lines(lines):
+            self.add_series(total)
+
+    def end_series(self) -> None:
+        """
+        Finish the current series, if any - for example once the log is known to be complete.
+        """
+        total = self._series.end_series()
+        if total is not None:
+            self.add_series(total)
+
+    def ingest_file(self, file_path: Union[str, Path]) -> int:
+        """
+        Add the complete lines appended to a log file since it was last ingested. A final line without a newline
+        may still be being written, so it is left for the next call.
+
+        :param file_path: path to the log file, which must only ever be appended to
+        :return: number of bytes ingested
+        """
+        start_offset = self.offset
+        with MappedInput(file_path) as mapped:
+            if mapped.size < self.offset:
+                raise ValueError(f"{file_path} is shorter than the part of it already ingested")
+            for begin, end in mapped.chunks(begin=self.offset):
+                with mapped.buffer[begin:end] as chunk:
+                    if chunk[-1] != ord("\n"):
+                        end = begin + bytes(chunk).rfind(b"\n") + 1
+                    self.add_lines(io.StringIO(str(chunk[:end - begin], ENCODING), None))
+                self.offset = end
+        return self.offset - start_offset
+
+    def to_dict(self) -> dict:
+        """
+        The state of the tracker as a dict of JSON serializable values, from which from_dict() restores it.
+        """
+        return {
+            "k": self.k,
+            "offset": self.offset,
+            "series_count": self.series_count,
+            "top": self._top,
+            "max": self._max,
+            "current_total": self._series.total,
+            "in_series": self._series.in_series
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "CalorieTracker":
+        tracker = cls(state["k"])
+        tracker.offset = state["offset"]
+        tracker.series_count = state["series_count"]
+        tracker._top = list(state["top"])
+        heapq.heapify(tracker._top)
+        tracker._top_sum = sum(tracker._top)
+        tracker._max = state["max"]
+        tracker._series = CalorieSeries(state["current_total"], state["in_series"])
+        return tracker
+
+    def save(self, file_path: Union[str, Path]) -> None:
+        """
+        Checkpoint the state of the tracker to a JSON file, replacing it atomically.
+        """
+        import json
+
+        temporary_path = Path(f"{file_path}.{os.getpid()}.tmp")
+        temporary_path.write_text(json.dumps(self.to_dict()))
+        os.replace(temporary_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: Union[str, Path]) -> "CalorieTracker":
+        """
+        Resume a tracker from a checkpoint written by save().
+        """
+        import json
+
+        return cls.from_dict(json.loads(Path(file_path).read_text()))
+
 
-    for line in yield_lines(file_path):
-        stripped_line = line.strip()
-        if stripped_line:
-            current_total += int(stripped_line)
-        else:
-            in_top_three = False
-            for i in range(len(top_three)):
-                if current_total > top_three[i]:
-                    in_top_three = True
-                    beats_index = i
-            if in_top_three:
-                top_three.insert(beats_index + 1, current_total)
-                top_three.pop(0)
-            current_total = 0
-
-    return sum(top_three)
+DAY = 1
+PARTS = {
+    1: find_max_calories,
+    2: find_top_three_calories
+}
+ASYNC_PARTS = {
+    1: partial(find_top_k_calories_async, k=1),
+    2: partial(find_top_k_calories_async, k=3)
+}
+ALTERNATIVE_PARTS = {}
+if numpy_available():
+    ALTERNATIVE_PARTS = {
+        1: {"numpy": partial(find_top_k_calories_numpy, k=1)},
+        2: {"numpy": partial(find_top_k_calories_numpy, k=3)}
+    }
 
 
 if __name__ == "__main__":
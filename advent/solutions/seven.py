@@ -1,7 +1,10 @@
 from __future__ import annotations
+from array import array
 from typing import Optional
 from pathlib import Path
+from advent.cache import Arrays, cached_parser, strings_to_bytes, bytes_to_strings
 from advent.common import yield_lines, INPUTS_FOLDER
+from advent.instrumentation import phase, PARSE
 
 INPUT_FILE_NAME = "7.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
@@ -98,6 +101,7 @@ def find_smallest_folder_to_delete(file_path: str | Path, total_space_needed: in
     return smallest_size
 
 
+@phase()
 def find_smallest_folder_greater_than(root: Directory, additional_space_needed: int, current_smallest_size: int) -> int:
     """
     Find smallest folder in file system whose size is greater than 'additional_space_needed'.
@@ -114,6 +118,60 @@ def find_smallest_folder_greater_than(root: Directory, additional_space_needed:
     return current_smallest_size
 
 
+def encode_file_tree(root: Directory) -> Arrays:
+    """
+    Convert a file tree into arrays for caching. Directories are listed in pre-order, each with the index of its
+    parent directory (-1 for the root), files are listed with the index of the directory containing them.
+
+    :param root: root directory of the file tree
+    :return: dict of arrays describing the tree
+    """
+    directory_names: list[str] = []
+    directory_parents = array("q")
+    file_names: list[str] = []
+    file_directories = array("q")
+    file_sizes = array("q")
+    to_visit: list[tuple[Directory, int]] = [(root, -1)]
+    while to_visit:
+        directory, parent_index = to_visit.pop()
+        index = len(directory_names)
+        directory_names.append(directory.name)
+        directory_parents.append(parent_index)
+        for file in directory.files:
+            file_names.append(file.name)
+            file_directories.append(index)
+            file_sizes.append(file.size)
+        for sub_directory in reversed(directory.sub_directories):
+            to_visit.append((sub_directory, index))
+    return {
+        "directory_names": strings_to_bytes(directory_names),
+        "directory_parents": directory_parents,
+        "file_names": strings_to_bytes(file_names),
+        "file_directories": file_directories,
+        "file_sizes": file_sizes
+    }
+
+
+def decode_file_tree(arrays: Arrays) -> Directory:
+    directory_parents = arrays["directory_parents"]
+    directory_names = bytes_to_strings(arrays["directory_names"], len(directory_parents))
+    directories: list[Directory] = []
+    for name, parent_index in zip(directory_names, directory_parents):
+        parent = directories[parent_index] if parent_index >= 0 else None
+        directory = Directory(name=name, parent=parent)
+        if parent:
+            parent.sub_directories.append(directory)
+        directories.append(directory)
+    file_directories = arrays["file_directories"]
+    file_names = bytes_to_strings(arrays["file_names"], len(file_directories))
+    for name, directory_index, size in zip(file_names, file_directories, arrays["file_sizes"]):
+        directory = directories[directory_index]
+        directory.files.append(File(name, size, directory))
+    return directories[0]
+
+
+@phase(PARSE)
+@cached_parser("seven.file_tree.v1", encode=encode_file_tree, decode=decode_file_tree)
 def parse_commands_to_file_tree(file_path: str | Path) -> Directory:
     """
     Given a file which contains a list of commands for navigating a file system ('cd' and 'ls') and their output,
@@ -184,6 +242,7 @@ def print_tree_with_sizes(root: Directory) -> None:
         print_tree_with_sizes(sub_directory)
 
 
+@phase()
 def calculate_all_directory_sizes(root: Directory) -> int:
     files_size = sum(map(lambda file: file.size, root.files))
     sub_directories_size = 0
@@ -194,6 +253,7 @@ def calculate_all_directory_sizes(root: Directory) -> int:
     return total_size
 
 
+@phase()
 def calculate_sum_small_dir_sizes(root: Directory, folder_max_size: int = 100_000) -> int:
     total_size_small_directories = 0
     if root.size <= folder_max_size:
@@ -203,5 +263,12 @@ def calculate_sum_small_dir_sizes(root: Directory, folder_max_size: int = 100_00
     return total_size_small_directories
 
 
+DAY = 7
+PARTS = {
+    1: find_small_directories,
+    2: find_smallest_folder_to_delete
+}
+
+
 if __name__ == "__main__":
     print(find_smallest_folder_to_delete(INPUT_FILE_PATH))
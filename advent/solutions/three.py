@@ -1,11 +1,21 @@
+from functools import partial
 from pathlib import Path
-from typing import Union
-from advent.common import yield_lines, INPUTS_FOLDER
+from string import ascii_letters
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+from advent.common import MappedInput, async_yield_lines, select_part, yield_lines, INPUTS_FOLDER
+from advent.instrumentation import phase, PARSE
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader
 
 
 INPUT_FILE_NAME = "3.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
 
+# priorities 1 through 52 of a-z and A-Z, both by letter and by byte value (where anything else has priority 0)
+LETTER_PRIORITIES = {letter: priority for priority, letter in enumerate(ascii_letters, start=1)}
+BYTE_PRIORITIES = bytes(LETTER_PRIORITIES.get(chr(byte), 0) for byte in range(256))
+
 
 def calculate_priority_sum(file_path: Union[str, Path]) -> int:
     """
@@ -21,14 +31,37 @@ def calculate_priority_sum(file_path: Union[str, Path]) -> int:
     priority_sum = 0
 
     for line in yield_lines(file_path):
-        string = line.strip()
-        repeated_letter = find_letter_in_both_halves(string)
-        letter_priority_score = get_letter_priority_score(repeated_letter)
-        priority_sum += letter_priority_score
+        priority_sum += calculate_line_priority(line)
 
     return priority_sum
 
 
+async def calculate_priority_sum_async(reader: "StreamReader") -> int:
+    """
+    Solve the first part of the third day challenge while the input arrives on a stream, scoring each rucksack as
+    soon as its line is complete instead of mapping a file.
+
+    :param reader: stream to read input from
+    :return: sum of priority scores
+    """
+    priority_sum = 0
+
+    async for line in async_yield_lines(reader):
+        priority_sum += calculate_line_priority(line)
+
+    return priority_sum
+
+
+def calculate_line_priority(line: str) -> int:
+    """
+    Find the letter present in both halves of the given line and return its priority score.
+    """
+    string = line.strip()
+    repeated_letter = find_letter_in_both_halves(string)
+    return get_letter_priority_score(repeated_letter)
+
+
+@phase()
 def find_letter_in_both_halves(string: str) -> str:
     """
     Given a string of even length, find the letter present in both halves of the string.
@@ -49,6 +82,7 @@ def find_letter_in_both_halves(string: str) -> str:
             return string[i]
 
 
+@phase()
 def get_letter_priority_score(letter: str) -> int:
     """
     Convert a letter to a score, ranging 1-26 for a-z and 27-53 A-Z.
@@ -56,11 +90,107 @@ def get_letter_priority_score(letter: str) -> int:
     :param letter: a letter
     :return: score
     """
-    assert len(letter) == 1
-    if letter.isupper():
-        return ord(letter) - 38
-    else:
-        return ord(letter) - 96
+    return LETTER_PRIORITIES[letter]
+
+
+def calculate_priority_sum_bytes(file_path: Union[str, Path]) -> int:
+    """
+    Same as calculate_priority_sum, but working on the raw bytes of each line: the letter in both halves is found
+    by intersecting the set of bytes of the first half with the second half, which happens entirely in C, and its
+    priority is looked up by byte value.
+
+    :param file_path: path to input file
+    :return: sum of priority scores
+    """
+    return sum_priorities(yield_rucksacks(file_path), group_size=None)[0]
+
+
+def calculate_priority_sums(file_path: Union[str, Path], group_size: int = 3) -> tuple[int, int]:
+    """
+    Solve both parts of the third day challenge in a single pass over the input, see sum_priorities.
+
+    :param file_path: path to input file
+    :param group_size: number of lines in each group, 3 for part 2
+    :return: sum of priority scores of the letters in both halves of each line, and of the letters common to groups
+    """
+    return sum_priorities(yield_rucksacks(file_path), group_size)
+
+
+@phase()
+def sum_priorities(
+        rucksacks: Iterable[bytes],
+        group_size: Optional[int] = 3,
+        split_halves: bool = True
+) -> tuple[int, int]:
+    """
+    Engine behind both parts of the third day challenge, going through the rucksacks (lines as bytes) once.
+
+    For each rucksack, the letter in both of its halves is found by intersecting the set of bytes of the first half
+    with the second half, and for each group of group_size consecutive rucksacks, the letter common to all of them by
+    intersecting the set of bytes of the first rucksack with each following one as it comes. Both happen entirely in
+    C, and priorities are looked up by byte value. Only a single set is kept for the group in flight, so any group
+    size takes constant memory. Rucksacks of an incomplete last group are ignored.
+
+    :param rucksacks: lines of the input, as bytes without line terminators
+    :param group_size: number of rucksacks in each group, None to only look at halves
+    :param split_halves: whether to look at the halves of each rucksack
+    :return: sum of priorities of the letters in both halves (0 if not split_halves), and sum of priorities of the
+        letters common to each group (0 if group_size is None)
+    """
+    if group_size is not None and group_size < 2:
+        raise ValueError("group_size must be at least 2")
+    halves_sum = 0
+    groups_sum = 0
+    group_items: Optional[set[int]] = None
+    rucksacks_in_group = 0
+
+    for rucksack in rucksacks:
+        if split_halves:
+            half = len(rucksack) // 2
+            halves_sum += BYTE_PRIORITIES[set(rucksack[:half]).intersection(rucksack[half:]).pop()]
+        if group_size is not None:
+            if group_items is None:
+                group_items = set(rucksack)
+            else:
+                group_items.intersection_update(rucksack)
+            rucksacks_in_group += 1
+            if rucksacks_in_group == group_size:
+                groups_sum += BYTE_PRIORITIES[group_items.pop()]
+                group_items = None
+                rucksacks_in_group = 0
+
+    return halves_sum, groups_sum
+
+
+@phase(PARSE)
+def yield_rucksacks(file_path: Union[str, Path]) -> Iterator[bytes]:
+    """
+    Generator yielding the lines of the input file as bytes, without line terminators. The file is split into lines
+    chunk by chunk, nothing is decoded.
+
+    :param file_path: path to input file
+    """
+    with MappedInput(file_path) as mapped:
+        for begin, end in mapped.chunks():
+            with mapped.buffer[begin:end] as chunk:
+                lines = bytes(chunk).splitlines()
+            yield from lines
+
+
+DAY = 3
+PARTS = {
+    1: calculate_priority_sum_bytes
+}
+ASYNC_PARTS = {
+    1: calculate_priority_sum_async
+}
+ALTERNATIVE_PARTS = {
+    1: {
+        "per-letter": calculate_priority_sum,
+        "single-pass": partial(select_part, calculate_priority_sums, 1)
+    },
+    2: {"single-pass": partial(select_part, calculate_priority_sums, 2)}
+}
 
 
 if __name__ == "__main__":
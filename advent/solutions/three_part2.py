@@ -1,14 +1,18 @@
 from pathlib import Path
-from typing import Union, List, Set, Dict
-from advent.common import yield_lines, INPUTS_FOLDER
-from advent.solutions.three import get_letter_priority_score
+from typing import TYPE_CHECKING, Union, List, Set, Dict
+from advent.common import async_yield_lines, yield_lines, INPUTS_FOLDER
+from advent.instrumentation import phase
+from advent.solutions import three
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader
 
 
 INPUT_FILE_NAME = "3.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
 
 
-def calculate_priority_sum(file_path: Union[str, Path]) -> int:
+def calculate_priority_sum(file_path: Union[str, Path], group_size: int = 3) -> int:
     """
     Function which solves part 2 of the third day challenge on Advent of Code.
 
@@ -18,9 +22,9 @@ def calculate_priority_sum(file_path: Union[str, Path]) -> int:
     27 through 52 for A-Z. Return the sum of priority scores for all groups of three in the whole file.
 
     :param file_path:
+    :param group_size: number of lines in each group
     :return:
     """
-    group_size = 3
     counter = 1
 
     priority_sum = 0
@@ -34,7 +38,7 @@ def calculate_priority_sum(file_path: Union[str, Path]) -> int:
 
         if counter % group_size == 0:
             common_letter = find_common_letter(group_letter_sets)
-            letter_priority_score = get_letter_priority_score(common_letter)
+            letter_priority_score = three.get_letter_priority_score(common_letter)
             priority_sum += letter_priority_score
             group_letter_sets = []
 
@@ -43,6 +47,40 @@ def calculate_priority_sum(file_path: Union[str, Path]) -> int:
     return priority_sum
 
 
+def calculate_priority_sum_bytes(file_path: Union[str, Path], group_size: int = 3) -> int:
+    """
+    Same as calculate_priority_sum, but working on the raw bytes of each line, see three.sum_priorities.
+
+    :param file_path: path to input file
+    :param group_size: number of lines in each group
+    :return: sum of priority scores of all groups
+    """
+    return three.sum_priorities(three.yield_rucksacks(file_path), group_size, split_halves=False)[1]
+
+
+async def calculate_priority_sum_async(reader: "StreamReader", group_size: int = 3) -> int:
+    """
+    Solve the second part of the third day challenge while the input arrives on a stream - a group is scored as soon
+    as its last rucksack is read, only the letter sets of the current group are kept.
+
+    :param reader: stream to read input from
+    :param group_size: number of lines in each group
+    :return: sum of priority scores of all groups
+    """
+    priority_sum = 0
+    group_letter_sets: List[Set[str]] = []
+
+    async for line in async_yield_lines(reader):
+        group_letter_sets.append(set(line.strip()))
+        if len(group_letter_sets) == group_size:
+            common_letter = find_common_letter(group_letter_sets)
+            priority_sum += three.get_letter_priority_score(common_letter)
+            group_letter_sets = []
+
+    return priority_sum
+
+
+@phase()
 def find_common_letter(letter_sets: List[Set[str]]) -> str:
     """
     Given a list of sets containing letters, find the letter present in every set (there should be one such letter).
@@ -62,5 +100,17 @@ def find_common_letter(letter_sets: List[Set[str]]) -> str:
                 letter_counts[letter] = letter_occurrences + 1
 
 
+DAY = 3
+PARTS = {
+    2: calculate_priority_sum_bytes
+}
+ASYNC_PARTS = {
+    2: calculate_priority_sum_async
+}
+ALTERNATIVE_PARTS = {
+    2: {"per-letter": calculate_priority_sum}
+}
+
+
 if __name__ == "__main__":
     print(calculate_priority_sum(INPUT_FILE_PATH))
@@ -1,7 +1,11 @@
-from typing import Union, Tuple
+from typing import TYPE_CHECKING, Callable, Iterable, Union, Tuple
 from pathlib import Path
 from enum import Enum
-from advent.common import yield_lines, INPUTS_FOLDER
+from advent.common import MappedInput, async_yield_lines, yield_lines, INPUTS_FOLDER, STREAM_CHUNK_SIZE
+from advent.instrumentation import phase, PARSE
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader
 
 
 INPUT_FILE_NAME = "2.txt"
@@ -14,6 +18,7 @@ class GameElement(Enum):
     SCISSORS = 3
 
     @classmethod
+    @phase(PARSE)
     def from_letter(cls, letter: str):
         if letter in ("A", "X"):
             return cls.ROCK
@@ -53,15 +58,38 @@ def calculate_total_score(file_path: Union[Path, str]) -> int:
     total_score = 0
 
     for line in yield_lines(file_path):
-        p1_letter, p2_letter = parse_player_letters(line)
-        p1_choice = GameElement.from_letter(p1_letter)
-        p2_choice = GameElement.from_letter(p2_letter)
-        round_score = calculate_round_score(p1_choice, p2_choice)
-        total_score += round_score
+        total_score += calculate_line_score(line)
 
     return total_score
 
 
+async def calculate_total_score_async(reader: "StreamReader") -> int:
+    """
+    Solve the first part of the second day challenge while the input arrives on a stream, scoring each round as soon
+    as its line is complete rather than counting the rounds of a whole file first.
+
+    :param reader: stream to read input from
+    :return: int total score of player 1
+    """
+    total_score = 0
+
+    async for line in async_yield_lines(reader):
+        total_score += calculate_line_score(line)
+
+    return total_score
+
+
+def calculate_line_score(line: str) -> int:
+    """
+    Calculate the score of player 1 for the round on the given line.
+    """
+    p1_letter, p2_letter = parse_player_letters(line)
+    p1_choice = GameElement.from_letter(p1_letter)
+    p2_choice = GameElement.from_letter(p2_letter)
+    return calculate_round_score(p1_choice, p2_choice)
+
+
+@phase(PARSE)
 def parse_player_letters(line: str) -> Tuple[str, str]:
     line = line.strip("\n")
     first_letter, second_letter = line.split(" ")
@@ -76,6 +104,7 @@ def parse_player_letters(line: str) -> Tuple[str, str]:
     return p1_letter, p2_letter
 
 
+@phase()
 def calculate_round_score(player_1_choice: GameElement, player_2_choice: GameElement) -> int:
     return calculate_outcome_score(player_1_choice, player_2_choice) + player_1_choice.value
 
@@ -108,5 +137,198 @@ def calculate_outcome_score(player_1_choice: GameElement, player_2_choice: GameE
         raise Exception("something is wrong")
 
 
+# every possible round, as (opponent's letter, your letter)
+ROUNDS = [(opponent_letter, own_letter) for opponent_letter in "ABC" for own_letter in "XYZ"]
+
+
+def build_score_table(score_round: Callable[[str, str], int]) -> dict[Tuple[str, str], int]:
+    """
+    Precompute the score of each of the nine possible rounds.
+
+    :param score_round: function returning the score of a round, given the opponent's letter and your letter
+    :return: dict mapping (opponent's letter, your letter) to score
+    """
+    return {(opponent_letter, own_letter): score_round(opponent_letter, own_letter)
+            for opponent_letter, own_letter in ROUNDS}
+
+
+ROUND_SCORES = build_score_table(
+    lambda opponent_letter, own_letter: calculate_round_score(
+        GameElement.from_letter(own_letter),
+        GameElement.from_letter(opponent_letter)
+    )
+)
+
+
+class RoundCounter:
+    """
+    Counts how many times each of the nine possible rounds is played, without parsing the strategy guide line by
+    line. The guide can be fed in pieces of any size, for example as they are read from a file or a stream.
+
+    Whether the opponent's letter comes first is detected once, from the first line which is not blank, then the
+    occurrences of each of the nine possible lines are counted in bulk. A piece is valid if those account for every
+    line and every byte other than line terminators. Otherwise - if it has blank lines, which are skipped, or lines
+    which are not a valid round, which are rejected - it is checked and counted line by line instead.
+
+    Usage:
+
+        counter = RoundCounter()
+        for data in pieces:
+            counter.feed(data)
+        counts = counter.finish()
+    """
+    counts: dict[Tuple[str, str], int]
+
+    def __init__(self) -> None:
+        self.counts = dict.fromkeys(ROUNDS, 0)
+        self._patterns: dict[Tuple[str, str], bytes] | None = None
+        # the incomplete last line of the data fed so far
+        self._pending = b""
+
+    def feed(self, data: bytes) -> None:
+        """
+        Count the rounds in the next piece of the guide. Pieces can end anywhere, an incomplete last line is only
+        counted once the rest of it is fed.
+
+        :raises Exception: if a line of the piece is neither blank nor a valid round
+        """
+        if self._pending:
+            data = self._pending + data
+        last_newline = data.rfind(b"\n")
+        if last_newline + 1 < len(data):
+            self._pending = data[last_newline + 1:]
+            data = data[:last_newline + 1]
+        else:
+            self._pending = b""
+        self._count(data)
+
+    def _count(self, data: bytes) -> None:
+        if self._patterns is None:
+            first_letter = data.lstrip()[:1]
+            if not first_letter:
+                return
+            opponent_first = first_letter in (b"A", b"B", b"C")
+            self._patterns = {
+                (opponent_letter, own_letter): (
+                    f"{opponent_letter} {own_letter}" if opponent_first else f"{own_letter} {opponent_letter}"
+                ).encode()
+                for opponent_letter, own_letter in ROUNDS
+            }
+        counts = {key: data.count(pattern) for key, pattern in self._patterns.items()}
+        newline_count = data.count(b"\n")
+        line_count = newline_count + (not data.endswith(b"\n"))
+        crlf_count = data.count(b"\r\n")
+        # every line is exactly one round, followed by '\n' or '\r\n' (except possibly the last one) - the rounds
+        # found cannot overlap, and account for every other byte, so a line can only hold two rounds if another one
+        # is empty, which is why data with empty lines is always counted line by line
+        if sum(counts.values()) != line_count or len(data) != 3 * line_count + newline_count + crlf_count \
+                or data.count(b"\r") != crlf_count or self._has_empty_line(data):
+            counts = self._count_lines(data)
+        for key, count in counts.items():
+            self.counts[key] += count
+
+    @staticmethod
+    def _has_empty_line(data: bytes) -> bool:
+        return data.startswith((b"\n", b"\r\n")) or b"\n\n" in data or b"\n\r\n" in data
+
+    def _count_lines(self, data: bytes) -> dict[Tuple[str, str], int]:
+        """
+        Count the rounds in data line by line, skipping blank lines and rejecting anything else but a valid round.
+        """
+        keys = {pattern: key for key, pattern in self._patterns.items()}
+        counts = dict.fromkeys(ROUNDS, 0)
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            key = keys.get(line)
+            if key is None:
+                raise Exception("unexpected input data format")
+            counts[key] += 1
+        return counts
+
+    def finish(self) -> dict[Tuple[str, str], int]:
+        """
+        Count the last line, if it did not end with a newline.
+
+        :return: dict mapping (opponent's letter, your letter) to the number of rounds played
+        :raises Exception: if the last line is neither blank nor a valid round
+        """
+        self._count(self._pending)
+        self._pending = b""
+        return self.counts
+
+
+@phase(PARSE)
+def count_rounds(file_path: Union[str, Path]) -> dict[Tuple[str, str], int]:
+    """
+    Count how many times each of the nine possible rounds is played, see RoundCounter.
+
+    :param file_path: path to input file
+    :return: dict mapping (opponent's letter, your letter) to the number of rounds played
+    """
+    counter = RoundCounter()
+    with MappedInput(file_path) as mapped:
+        for begin, end in mapped.chunks():
+            with mapped.buffer[begin:end] as chunk:
+                counter.feed(bytes(chunk))
+    return counter.finish()
+
+
+async def count_rounds_async(
+        reader: "StreamReader",
+        chunk_size: int = STREAM_CHUNK_SIZE
+) -> dict[Tuple[str, str], int]:
+    """
+    Count how many times each round is played while the guide arrives on a stream - each chunk is fed to a
+    RoundCounter as it is read, which carries a line split between chunks over to the next one.
+
+    :param reader: stream to read input from
+    :param chunk_size: maximum number of bytes to read at once
+    :return: dict mapping (opponent's letter, your letter) to the number of rounds played
+    """
+    counter = RoundCounter()
+    while data := await reader.read(chunk_size):
+        counter.feed(data)
+    return counter.finish()
+
+
+def merge_counts(partial_counts: Iterable[dict[Tuple[str, str], int]]) -> dict[Tuple[str, str], int]:
+    """
+    Add up the counts of rounds of several parts of a strategy guide.
+    """
+    counts = dict.fromkeys(ROUNDS, 0)
+    for partial in partial_counts:
+        for key, count in partial.items():
+            counts[key] += count
+    return counts
+
+
+def score_counts(counts: dict[Tuple[str, str], int], score_table: dict[Tuple[str, str], int]) -> int:
+    return sum(count * score_table[key] for key, count in counts.items())
+
+
+def calculate_total_score_by_counts(file_path: Union[str, Path]) -> int:
+    """
+    Same as calculate_total_score, but counting how many times each round is played first, then multiplying the
+    counts by the precomputed score of each round.
+
+    :param file_path: path to input file
+    :return: int total score of player 1
+    """
+    return score_counts(count_rounds(file_path), ROUND_SCORES)
+
+
+DAY = 2
+PARTS = {
+    1: calculate_total_score_by_counts
+}
+ASYNC_PARTS = {
+    1: calculate_total_score_async
+}
+ALTERNATIVE_PARTS = {
+    1: {"per-line": calculate_total_score}
+}
+
+
 if __name__ == "__main__":
     print(calculate_total_score(INPUT_FILE_PATH))
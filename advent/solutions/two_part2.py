@@ -1,7 +1,13 @@
-from typing import Union, Tuple
+from functools import partial
+from typing import TYPE_CHECKING, Union, Tuple
 from pathlib import Path
 from enum import Enum
-from advent.common import yield_lines, INPUTS_FOLDER
+from advent.common import async_yield_lines, select_part, yield_lines, INPUTS_FOLDER
+from advent.instrumentation import phase, PARSE
+from advent.solutions import two
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader
 
 
 INPUT_FILE_NAME = "2.txt"
@@ -69,14 +75,37 @@ def calculate_total_score(file_path: Union[str, Path]) -> int:
     total_score = 0
 
     for line in yield_lines(file_path):
-        opponent_pick, outcome = parse_line(line)
-        my_pick = pick_game_element(opponent_pick, outcome)
-        round_score = outcome.value + my_pick.value
-        total_score += round_score
+        total_score += calculate_line_score(line)
+
+    return total_score
+
+
+async def calculate_total_score_async(reader: "StreamReader") -> int:
+    """
+    Solve the second part of the second day challenge while the input arrives on a stream, picking the shape and
+    scoring each round as soon as its line is complete.
+
+    :param reader: stream to read input from
+    :return: int total score of player 1
+    """
+    total_score = 0
+
+    async for line in async_yield_lines(reader):
+        total_score += calculate_line_score(line)
 
     return total_score
 
 
+def calculate_line_score(line: str) -> int:
+    """
+    Calculate your score for the round on the given line, picking the shape which leads to the given outcome.
+    """
+    opponent_pick, outcome = parse_line(line)
+    my_pick = pick_game_element(opponent_pick, outcome)
+    return outcome.value + my_pick.value
+
+
+@phase(PARSE)
 def parse_line(line: str) -> Tuple[GameElement, Outcome]:
     line = line.strip("\n")
     first_letter, second_letter = line.split(" ")
@@ -88,6 +117,7 @@ def parse_line(line: str) -> Tuple[GameElement, Outcome]:
         raise Exception("unexpected input data format")
 
 
+@phase()
 def pick_game_element(opponent_pick: GameElement, game_outcome: Outcome) -> GameElement:
     """
     Given the opponent's pick in rock-paper-scissors and the supposed outcome of the game,
@@ -121,5 +151,64 @@ def pick_game_element(opponent_pick: GameElement, game_outcome: Outcome) -> Game
         raise Exception("something went wrong")
 
 
+# with the second letter meaning the outcome of the round, rather than your pick
+ROUND_SCORES = two.build_score_table(
+    lambda opponent_letter, outcome_letter: calculate_line_score(f"{opponent_letter} {outcome_letter}")
+)
+
+
+def calculate_total_score_by_counts(file_path: Union[str, Path]) -> int:
+    """
+    Same as calculate_total_score, but counting how many times each round is played first, then multiplying the
+    counts by the precomputed score of each round.
+
+    :param file_path: path to input file
+    :return: int total score of player 1
+    """
+    return two.score_counts(two.count_rounds(file_path), ROUND_SCORES)
+
+
+def calculate_both_total_scores(file_path: Union[str, Path]) -> Tuple[int, int]:
+    """
+    Solve both parts of the second day challenge in a single pass over the input: the rounds are counted once,
+    and the counts are scored with the score table of each part.
+
+    :param file_path: path to input file
+    :return: total score of part 1 and total score of part 2
+    """
+    return score_both_parts(two.count_rounds(file_path))
+
+
+async def calculate_both_total_scores_async(reader: "StreamReader") -> Tuple[int, int]:
+    """
+    Score both parts of the second day challenge from the counts of rounds of a guide arriving on a stream, see
+    two.count_rounds_async.
+
+    :param reader: stream to read input from
+    :return: total score of part 1 and total score of part 2
+    """
+    return score_both_parts(await two.count_rounds_async(reader))
+
+
+def score_both_parts(counts: dict[Tuple[str, str], int]) -> Tuple[int, int]:
+    return two.score_counts(counts, two.ROUND_SCORES), two.score_counts(counts, ROUND_SCORES)
+
+
+DAY = 2
+PARTS = {
+    2: calculate_total_score_by_counts
+}
+ASYNC_PARTS = {
+    2: calculate_total_score_async
+}
+ALTERNATIVE_PARTS = {
+    1: {"single-pass": partial(select_part, calculate_both_total_scores, 1)},
+    2: {
+        "per-line": calculate_total_score,
+        "single-pass": partial(select_part, calculate_both_total_scores, 2)
+    }
+}
+
+
 if __name__ == "__main__":
     print(calculate_total_score(INPUT_FILE_PATH))
\ No newline at end of file
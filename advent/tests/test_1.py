@@ -1,6 +1,9 @@
+import pytest
 from pathlib import Path
-from advent.common import TEST_INPUTS_FOLDER
-from advent.solutions.one import find_max_calories, find_top_three_calories
+from advent.common import TEST_INPUTS_FOLDER, MappedInput
+from advent.solutions import one
+from advent.solutions.one import CalorieTracker, calorie_totals_numpy, find_max_calories, find_top_k_calories, \
+    find_top_k_calories_numpy, find_top_three_calories
 
 
 TEST_INPUT_FILE_NAME = "1.txt"
@@ -15,3 +18,115 @@ def test_find_max_calories():
 def test_find_top_three_calories():
     result = find_top_three_calories(TEST_INPUT_FILE_PATH)
     assert result == 15113
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5, 100])
+def test_find_top_k_calories(k, tmp_path):
+    totals = [4, 17, 9, 30, 2, 30, 11]
+    file_path = Path(tmp_path, "input.txt")
+    # the last block is not followed by an empty line
+    file_path.write_text("\n\n".join(f"{total - 1}\n1" for total in totals))
+    assert find_top_k_calories(file_path, k) == sum(sorted(totals, reverse=True)[:k])
+
+
+@pytest.mark.parametrize("contents, maximum, top_three", [
+    # the last block counts without an empty line after it
+    ("1\n\n2\n3", 5, 6),
+    # consecutive empty lines do not make empty blocks
+    ("\n\n1\n\n\n\n2\n\n\n", 2, 3),
+    ("", 0, 0)
+])
+def test_find_max_and_top_three_calories_blocks(contents, maximum, top_three, tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_text(contents)
+    assert find_max_calories(file_path) == maximum
+    assert find_top_three_calories(file_path) == top_three
+
+
+def test_find_top_k_calories_invalid_k():
+    with pytest.raises(ValueError):
+        find_top_k_calories(TEST_INPUT_FILE_PATH, 0)
+
+
+@pytest.mark.parametrize("k", [1, 3, 10])
+@pytest.mark.parametrize("chunk_size", [16, 1 << 22])
+def test_find_top_k_calories_numpy(k, chunk_size):
+    pytest.importorskip("numpy")
+    expected = find_top_k_calories(TEST_INPUT_FILE_PATH, k)
+    assert find_top_k_calories_numpy(TEST_INPUT_FILE_PATH, k, chunk_size) == expected
+
+
+def test_find_top_k_calories_numpy_crlf(tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(TEST_INPUT_FILE_PATH.read_bytes().replace(b"\n", b"\r\n"))
+    chunk_sums = []
+    monkeypatch.setattr(one, "calorie_totals_numpy", lambda chunk: chunk_sums.append(calorie_totals_numpy(chunk))
+                        or chunk_sums[-1])
+    assert find_top_k_calories_numpy(file_path, 3, chunk_size=16) == 15113
+    # split into chunks on the empty lines, rather than read as a single chunk
+    assert len(chunk_sums) > 1
+    with MappedInput(file_path) as mapped:
+        assert mapped.line_terminator() == b"\r\n"
+    with MappedInput(TEST_INPUT_FILE_PATH) as mapped:
+        assert mapped.line_terminator() == b"\n"
+
+
+@pytest.mark.parametrize("contents, totals", [
+    (b"", []),
+    (b"\n\n", []),
+    (b"5", [5]),
+    (b"1\r\n2\r\n\r\n\r\n30\n\n", [3, 30]),
+    (b"\n123456789012\n7\n\n8", [123456789019, 8])
+])
+def test_calorie_totals_numpy(contents, totals):
+    pytest.importorskip("numpy")
+    assert calorie_totals_numpy(contents).tolist() == totals
+
+
+def test_calorie_tracker_matches_find_top_k_calories():
+    tracker = CalorieTracker(k=3)
+    tracker.ingest_file(TEST_INPUT_FILE_PATH)
+    tracker.end_series()
+    assert tracker.max_calories == find_top_k_calories(TEST_INPUT_FILE_PATH, 1)
+    assert tracker.top_sum == find_top_k_calories(TEST_INPUT_FILE_PATH, 3)
+    assert sum(tracker.top()) == tracker.top_sum
+
+
+def test_calorie_tracker_ingests_appended_lines(tmp_path):
+    log_path = Path(tmp_path, "log.txt")
+    tracker = CalorieTracker(k=2)
+    log_path.write_text("1\n2\n\n10\n")
+    assert tracker.ingest_file(log_path) == 8
+    assert (tracker.max_calories, tracker.top_sum, tracker.series_count) == (3, 3, 1)
+
+    # the last line is incomplete, so it is left for the next call
+    with open(log_path, "a") as log:
+        log.write("\n5\n\n7")
+    tracker.ingest_file(log_path)
+    assert tracker.top() == [10, 5]
+    with open(log_path, "a") as log:
+        log.write("0\n")
+    assert tracker.ingest_file(log_path) == 3
+    assert tracker.ingest_file(log_path) == 0
+    tracker.end_series()
+    assert tracker.top() == [70, 10]
+    assert (tracker.max_calories, tracker.top_sum, tracker.series_count) == (70, 80, 4)
+
+
+def test_calorie_tracker_checkpoint(tmp_path):
+    log_path = Path(tmp_path, "log.txt")
+    checkpoint_path = Path(tmp_path, "checkpoint.json")
+    log_path.write_text("4\n\n6\n\n1\n")
+    tracker = CalorieTracker(k=2)
+    tracker.ingest_file(log_path)
+    tracker.save(checkpoint_path)
+
+    with open(log_path, "a") as log:
+        log.write("8\n\n")
+    resumed = CalorieTracker.load(checkpoint_path)
+    resumed.ingest_file(log_path)
+    assert resumed.top() == [9, 6]
+    uninterrupted = CalorieTracker(k=2)
+    uninterrupted.ingest_file(log_path)
+    assert resumed.to_dict() == uninterrupted.to_dict()
@@ -1,7 +1,11 @@
+import asyncio
+import pytest
 from pathlib import Path
 from advent.common import TEST_INPUTS_FOLDER
-from advent.solutions.two import calculate_total_score
-from advent.solutions.two_part2 import calculate_total_score as calculate_total_score_part2
+from advent.solutions.two import RoundCounter, calculate_total_score, calculate_total_score_by_counts, count_rounds
+from advent.solutions.two_part2 import calculate_total_score as calculate_total_score_part2, \
+    calculate_total_score_by_counts as calculate_total_score_by_counts_part2, calculate_both_total_scores, \
+    calculate_both_total_scores_async
 
 
 TEST_INPUT_FILE_NAME = "2.txt"
@@ -16,3 +20,61 @@ def test_calculate_total_score():
 def test_calculate_total_score_part_2():
     result = calculate_total_score_part2(TEST_INPUT_FILE_PATH)
     assert result == 12
+
+
+def test_calculate_total_score_by_counts():
+    assert calculate_total_score_by_counts(TEST_INPUT_FILE_PATH) == 15
+    assert calculate_total_score_by_counts_part2(TEST_INPUT_FILE_PATH) == 12
+
+
+@pytest.mark.parametrize("contents", [
+    "A Y\r\nB X\r\nC Z\r\nA Y",
+    "Y A\nX B\nZ C\nY A\n",
+    "\n \nY A\nX B\n\nZ C\r\n\r\nY A\n\n"
+])
+def test_count_rounds(contents, tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(contents.encode())
+    counts = count_rounds(file_path)
+    assert {key: count for key, count in counts.items() if count} == {("A", "Y"): 2, ("B", "X"): 1, ("C", "Z"): 1}
+
+
+@pytest.mark.parametrize("contents", [
+    "A Y\nB Q\n",
+    "A Y\nX B\n",
+    "A YB X\n",
+    "AA Y\n",
+    "A Y\nA  Y\n",
+    " A Y\n",
+    "A Y\nB X\nC",
+    "A XA Y\n\n",
+    "\nA XA Y\n",
+    "A X\r\n\r\nA XA Y\r\n"
+])
+def test_count_rounds_rejects_unexpected_lines(contents, tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_text(contents)
+    with pytest.raises(Exception, match="unexpected input data format"):
+        count_rounds(file_path)
+
+
+def test_calculate_both_total_scores():
+    assert calculate_both_total_scores(TEST_INPUT_FILE_PATH) == (15, 12)
+
+
+def test_calculate_both_total_scores_async():
+    async def solve_stream() -> tuple[int, int]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(TEST_INPUT_FILE_PATH.read_bytes())
+        reader.feed_eof()
+        return await calculate_both_total_scores_async(reader)
+
+    assert asyncio.run(solve_stream()) == (15, 12)
+
+
+def test_round_counter_pieces_can_end_anywhere():
+    contents = TEST_INPUT_FILE_PATH.read_bytes()
+    counter = RoundCounter()
+    for i in range(len(contents)):
+        counter.feed(contents[i:i + 1])
+    assert counter.finish() == count_rounds(TEST_INPUT_FILE_PATH)
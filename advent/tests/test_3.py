@@ -1,7 +1,10 @@
+import pytest
 from pathlib import Path
 from advent.common import TEST_INPUTS_FOLDER
-from advent.solutions.three import calculate_priority_sum
-from advent.solutions.three_part2 import calculate_priority_sum as calculate_priority_sum_part2
+from advent.solutions.three import calculate_priority_sum, calculate_priority_sum_bytes, calculate_priority_sums, \
+    get_letter_priority_score
+from advent.solutions.three_part2 import calculate_priority_sum as calculate_priority_sum_part2, \
+    calculate_priority_sum_bytes as calculate_priority_sum_bytes_part2
 
 
 TEST_INPUT_FILE_NAME = "3.txt"
@@ -16,3 +19,30 @@ def test_calculate_priority_sum():
 def test_calculate_priority_sum_part_2():
     result = calculate_priority_sum_part2(TEST_INPUT_FILE_PATH)
     assert result == 70
+
+
+@pytest.mark.parametrize("line_ending", ["\n", "\r\n"])
+def test_calculate_priority_sum_bytes(line_ending, tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(line_ending.join(TEST_INPUT_FILE_PATH.read_text().splitlines()).encode())
+    assert calculate_priority_sum_bytes(file_path) == 157
+    assert calculate_priority_sum_bytes_part2(file_path) == 70
+
+
+@pytest.mark.parametrize(["letter", "priority"], [("a", 1), ("z", 26), ("A", 27), ("Z", 52)])
+def test_get_letter_priority_score(letter, priority):
+    assert get_letter_priority_score(letter) == priority
+
+
+def test_calculate_priority_sums():
+    assert calculate_priority_sums(TEST_INPUT_FILE_PATH) == (157, 70)
+
+
+def test_priority_sums_of_any_group_size(tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    # one group of five sharing X, followed by an incomplete group
+    file_path.write_text("abcX\ndXef\ngXhi\nXjkl\nmnXo\npq\n")
+    assert calculate_priority_sum_part2(file_path, group_size=5) == 50
+    assert calculate_priority_sum_bytes_part2(file_path, group_size=5) == 50
+    with pytest.raises(ValueError):
+        calculate_priority_sum_bytes_part2(file_path, group_size=1)
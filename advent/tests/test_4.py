@@ -1,6 +1,22 @@
+import random
+from itertools import combinations
 from pathlib import Path
+import pytest
 from advent.common import TEST_INPUTS_FOLDER
-from advent.solutions.four import count_containments, count_overlaps
+from advent.solutions.four import (
+    IntervalIndex,
+    Range,
+    count_containing_and_overlapping_pairs,
+    count_containments,
+    count_containments_and_overlaps_numpy,
+    count_overlaps,
+    find_overlapping_pairs,
+    one_contains_other,
+    parse_ranges_buffer,
+    parse_ranges_line,
+    ranges_overlap,
+    yield_all_ranges
+)
 
 
 TEST_INPUTS_FILE_NAME = "4.txt"
@@ -15,3 +31,88 @@ def test_count_containments():
 def test_count_overlaps():
     result = count_overlaps(TEST_INPUTS_FILE_PATH)
     assert result == 4
+
+
+@pytest.mark.parametrize("chunk_size", [16, 1 << 24])
+def test_count_containments_and_overlaps_numpy(chunk_size):
+    pytest.importorskip("numpy")
+    result = count_containments_and_overlaps_numpy(TEST_INPUTS_FILE_PATH, chunk_size)
+    assert result == (2, 4)
+
+
+def test_count_containments_and_overlaps_numpy_crlf(tmp_path):
+    pytest.importorskip("numpy")
+    file_path = tmp_path / "4.txt"
+    file_path.write_bytes(TEST_INPUTS_FILE_PATH.read_bytes().replace(b"\n", b"\r\n").rstrip())
+    assert count_containments_and_overlaps_numpy(file_path) == (2, 4)
+
+
+def test_parse_ranges_buffer():
+    pytest.importorskip("numpy")
+    assert parse_ranges_buffer(b"2-4,6-8\n12-13,1-99").tolist() == [[2, 4, 6, 8], [12, 13, 1, 99]]
+    assert parse_ranges_buffer(b"2-4,6-8\r\n1-2,3-4\r\n").tolist() == [[2, 4, 6, 8], [1, 2, 3, 4]]
+    assert parse_ranges_buffer(b"").shape == (0, 4)
+
+
+@pytest.mark.parametrize("contents", [
+    b"2-4,6-8\n1-2\n",
+    b"2-4,6-8\nfoo",
+    b"2-4,6-8\n1-2,3-4x",
+    b"2-4,6-8\n\n1-2,3-4\n",
+    b"2-4,6-8\r1-2,3-4",
+    b" 2-4,6-8",
+    b"2-4,6,8\n",
+    b"2-4,6-8 \n",
+    b"\n"
+])
+def test_parse_ranges_buffer_rejects_unexpected_lines(contents):
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        parse_ranges_buffer(contents)
+
+
+def test_interval_index():
+    index = IntervalIndex.from_file(TEST_INPUTS_FILE_PATH)
+    ranges = [range_ for line in TEST_INPUTS_FILE_PATH.read_text().splitlines() for range_ in parse_ranges_line(line)]
+    assert len(index) == len(ranges)
+    assert index.max_depth == max(
+        sum(range_.begin <= point <= range_.end for range_ in ranges) for point in range(0, 12)
+    )
+    queries = [Range(begin, end) for begin in range(0, 12) for end in range(begin, 12)]
+    for begin, end in queries:
+        overlapping = sorted(range_ for range_ in ranges if ranges_overlap(range_, Range(begin, end)))
+        assert index.find_overlapping(begin, end) == overlapping
+        assert index.count_overlapping(begin, end) == len(overlapping)
+    assert index.count_overlapping_many(queries) == [index.count_overlapping(*query) for query in queries]
+    points = list(range(0, 12))
+    expected = [sum(range_.begin <= point <= range_.end for range_ in ranges) for point in points]
+    assert index.count_containing_many(points) == expected
+    assert [index.count_containing(point) for point in points] == expected
+
+
+def test_interval_index_empty():
+    index = IntervalIndex([])
+    assert index.max_depth == 0
+    assert index.count_containing(3) == 0
+    assert index.find_overlapping(1, 5) == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_count_containing_and_overlapping_pairs(seed):
+    generator = random.Random(seed)
+    ranges = [Range(begin, begin + generator.randint(0, 5)) for begin in generator.choices(range(20), k=40)]
+    pairs = list(combinations(ranges, 2))
+    expected_containing = sum(one_contains_other(*pair) for pair in pairs)
+    expected_overlapping = sum(ranges_overlap(*pair) for pair in pairs)
+    assert count_containing_and_overlapping_pairs(ranges) == (expected_containing, expected_overlapping)
+    overlapping = find_overlapping_pairs(ranges)
+    assert len(overlapping) == expected_overlapping
+    assert all(ranges_overlap(*pair) for pair in overlapping)
+    containing = list(find_overlapping_pairs(ranges, containing_only=True, stream=True))
+    assert len(containing) == expected_containing
+    assert all(range_1.begin <= range_2.begin and range_1.end >= range_2.end for range_1, range_2 in containing)
+
+
+def test_count_containing_and_overlapping_pairs_file():
+    assert count_containing_and_overlapping_pairs(yield_all_ranges(TEST_INPUTS_FILE_PATH)) == (29, 49)
+    assert count_containing_and_overlapping_pairs([]) == (0, 0)
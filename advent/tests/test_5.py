@@ -1,6 +1,23 @@
+import random
+from array import array
+from itertools import chain
 from pathlib import Path
+import pytest
 from advent.common import TEST_INPUTS_FOLDER, yield_lines
-from advent.solutions.five import compute_stack_tops, convert_to_stacks
+from advent.solutions.five import (
+    CrateHistory,
+    compute_both_stack_tops,
+    compute_stack_tops,
+    compute_stack_tops_bulk,
+    compute_stack_tops_reverse,
+    convert_to_stacks,
+    parse_drawing,
+    parse_input,
+    perform_move_part2,
+    perform_moves_part1,
+    simulate_stack_tops,
+    trace_stack_tops
+)
 
 
 TEST_INPUT_FILE_NAME = "5.txt"
@@ -30,4 +47,110 @@ def test_convert_to_stacks():
         "[Z] [M] [P]"
         ]
     stacks = convert_to_stacks(test_input, 3)
-    assert stacks == [["Z", "N"], ["M", "C", "D"], ["P"]]
\ No newline at end of file
+    assert stacks == [["Z", "N"], ["M", "C", "D"], ["P"]]
+
+
+def test_perform_moves():
+    stacks = [["Z", "N"], ["M", "C", "D"], ["P"]]
+    perform_moves_part1(2, 2, 1, stacks)
+    assert stacks == [["Z", "N", "D", "C"], ["M"], ["P"]]
+    perform_move_part2(3, 1, 3, stacks)
+    assert stacks == [["Z"], ["M"], ["P", "N", "D", "C"]]
+    perform_moves_part1(2, 3, 3, stacks)
+    perform_move_part2(2, 3, 3, stacks)
+    assert stacks == [["Z"], ["M"], ["P", "N", "D", "C"]]
+    perform_move_part2(0, 1, 2, stacks)
+    assert stacks == [["Z"], ["M"], ["P", "N", "D", "C"]]
+    with pytest.raises(IndexError):
+        perform_moves_part1(2, 1, 2, stacks)
+
+
+@pytest.mark.parametrize("part_1, expected", [(True, "CMZ"), (False, "MCD")])
+def test_compute_stack_tops_reverse(part_1, expected):
+    assert compute_stack_tops_reverse(TEST_INPUT_FILE_PATH, part_1) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("part_1", [True, False])
+def test_trace_stack_tops(seed, part_1):
+    generator = random.Random(seed)
+    stacks = [[generator.choice("ABCDEFGH") for _ in range(generator.randint(1, 8))] for _ in range(4)]
+    moves = []
+    heights = [len(stack) for stack in stacks]
+    for _ in range(50):
+        from_stack_id, to_stack_id = generator.randint(1, 4), generator.randint(1, 4)
+        count = generator.randint(0, heights[from_stack_id - 1])
+        if count == heights[from_stack_id - 1] and from_stack_id != to_stack_id:
+            continue
+        heights[from_stack_id - 1] -= count
+        heights[to_stack_id - 1] += count
+        moves.append([count, from_stack_id, to_stack_id])
+    expected_stacks = [list(stack) for stack in stacks]
+    perform_move = perform_moves_part1 if part_1 else perform_move_part2
+    for move in moves:
+        perform_move(*move, expected_stacks)
+    flat_moves = array("q", chain.from_iterable(moves))
+    expected = "".join(stack[-1] for stack in expected_stacks)
+    assert trace_stack_tops(stacks, flat_moves, part_1) == expected
+    assert simulate_stack_tops(stacks, flat_moves, part_1) == expected
+
+
+def test_parse_input():
+    stacks, moves = parse_input(TEST_INPUT_FILE_PATH)
+    assert stacks == [["Z", "N"], ["M", "C", "D"], ["P"]]
+    assert moves.tolist() == [1, 2, 1, 3, 1, 3, 2, 2, 1, 1, 1, 2]
+
+
+def test_parse_drawing():
+    lines = [b"    [D]", b"[N] [C]", b"[Z] [M] [P]", b" 1   2   3   4"]
+    assert parse_drawing(lines) == [["Z", "N"], ["M", "C", "D"], ["P"], []]
+    assert parse_drawing([b" 1   2"]) == [[], []]
+
+
+@pytest.mark.parametrize("part_1, expected", [(True, "CMZ"), (False, "MCD")])
+def test_compute_stack_tops_bulk_crlf(tmp_path, part_1, expected):
+    file_path = tmp_path / "5.txt"
+    file_path.write_bytes(TEST_INPUT_FILE_PATH.read_bytes().replace(b"\n", b"\r\n"))
+    assert compute_stack_tops_bulk(file_path, part_1) == expected
+    assert compute_stack_tops_bulk(TEST_INPUT_FILE_PATH, part_1) == expected
+
+
+def test_compute_both_stack_tops():
+    assert compute_both_stack_tops(TEST_INPUT_FILE_PATH) == ("CMZ", "MCD")
+
+
+@pytest.mark.parametrize("checkpoint_interval", [1, 3, 7, 1000])
+@pytest.mark.parametrize("part_1", [True, False])
+def test_crate_history(checkpoint_interval, part_1):
+    stacks, moves = parse_input(TEST_INPUT_FILE_PATH)
+    generator = random.Random(checkpoint_interval)
+    # keep moving crates between the stacks of the example, to have more moves than checkpoints
+    heights = [len(stack) for stack in stacks]
+    for count, from_stack_id, to_stack_id in zip(*[iter(moves)] * 3):
+        heights[from_stack_id - 1] -= count
+        heights[to_stack_id - 1] += count
+    for _ in range(20):
+        from_stack_id, to_stack_id = generator.sample(range(1, 4), 2)
+        count = generator.randint(0, heights[from_stack_id - 1])
+        heights[from_stack_id - 1] -= count
+        heights[to_stack_id - 1] += count
+        moves.extend([count, from_stack_id, to_stack_id])
+    history = CrateHistory(stacks, moves, part_1, checkpoint_interval)
+    assert history.move_count == 24
+    assert history.state_at(0) == stacks
+    for move in range(history.move_count + 1):
+        expected = [list(stack) for stack in stacks]
+        for count, from_stack_id, to_stack_id in zip(*[iter(moves[:3 * move])] * 3):
+            (perform_moves_part1 if part_1 else perform_move_part2)(count, from_stack_id, to_stack_id, expected)
+        assert history.state_at(move) == expected
+    with pytest.raises(IndexError):
+        history.state_at(history.move_count + 1)
+
+
+def test_crate_history_from_file():
+    history = CrateHistory.from_file(TEST_INPUT_FILE_PATH, part_1=True, checkpoint_interval=2)
+    assert history.tops_at(0) == "NDP"
+    assert history.tops_at(2) == " CZ"
+    assert history.tops_at(4) == "CMZ"
+    with pytest.raises(ValueError):
+        CrateHistory.from_file(TEST_INPUT_FILE_PATH, part_1=True, checkpoint_interval=0)
@@ -2,7 +2,7 @@ import pytest
 from pathlib import Path
 from advent.common import TEST_INPUTS_FOLDER
 from advent.solutions.six import find_first_unique_substring, find_first_unique_substring_combinations,\
-    find_first_unique_substring_set
+    find_first_unique_substring_last_seen, find_first_unique_substring_set
 
 
 @pytest.mark.parametrize(["test_input_file_name", "output"], [
@@ -75,3 +75,31 @@ def test_first_unique_substring_combinations_part2(test_input_file_name, output)
 def test_first_unique_substring_set_part2(test_input_file_name, output):
     test_input_file_path = Path(TEST_INPUTS_FOLDER, f"6_{test_input_file_name}.txt")
     assert find_first_unique_substring_set(test_input_file_path, 14) == output
+
+
+@pytest.mark.parametrize(["test_input_file_name", "output", "output_part2"], [
+    ("1", 7, 19),
+    ("2", 5, 23),
+    ("3", 6, 23),
+    ("4", 10, 29),
+    ("5", 11, 26)
+])
+def test_first_unique_substring_last_seen(test_input_file_name, output, output_part2):
+    test_input_file_path = Path(TEST_INPUTS_FOLDER, f"6_{test_input_file_name}.txt")
+    assert find_first_unique_substring_last_seen(test_input_file_path) == output
+    assert find_first_unique_substring_last_seen(test_input_file_path, 14) == output_part2
+
+
+def test_first_unique_substring_last_seen_missing(tmp_path):
+    test_input_file_path = tmp_path / "6.txt"
+    test_input_file_path.write_text("abcabcabc")
+    assert find_first_unique_substring_last_seen(test_input_file_path) is None
+    assert find_first_unique_substring_last_seen(test_input_file_path, 3) == 3
+
+
+@pytest.mark.parametrize("contents, output_length_3", [(b"aabc\n", 4), (b"aabc\r\n", 4), (b"abcabc\n\n", 3)])
+def test_first_unique_substring_last_seen_ignores_line_terminator(tmp_path, contents, output_length_3):
+    test_input_file_path = tmp_path / "6.txt"
+    test_input_file_path.write_bytes(contents)
+    assert find_first_unique_substring_last_seen(test_input_file_path) is None
+    assert find_first_unique_substring_last_seen(test_input_file_path, 3) == output_length_3
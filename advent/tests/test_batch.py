@@ -0,0 +1,35 @@
+from pathlib import Path
+from advent.batch import Job, solve_batch, solve_job, default_chunksize
+from advent.common import TEST_INPUTS_FOLDER
+
+
+def test_solve_job():
+    result = solve_job(Job(1, 2, Path(TEST_INPUTS_FOLDER, "1.txt")))
+    assert result.ok
+    assert result.answer == 15113
+
+
+def test_solve_job_failure():
+    result = solve_job(Job(4, 1, Path(TEST_INPUTS_FOLDER, "does_not_exist.txt")))
+    assert not result.ok
+    assert result.error.startswith("FileNotFoundError")
+    assert not solve_job(Job(30, 1, Path(TEST_INPUTS_FOLDER, "1.txt"))).ok
+
+
+def test_solve_batch_keeps_order_and_isolates_failures():
+    jobs = [
+        Job(4, 1, Path(TEST_INPUTS_FOLDER, "4.txt")),
+        Job(4, 2, Path(TEST_INPUTS_FOLDER, "5.txt")),
+        Job(9, 1, Path(TEST_INPUTS_FOLDER, "9.txt")),
+        Job(9, 1, Path(TEST_INPUTS_FOLDER, "9.txt")),
+        Job(2, 2, Path(TEST_INPUTS_FOLDER, "2.txt")),
+    ]
+    results = solve_batch(jobs, max_workers=2, chunksize=2)
+    assert [result.job for result in results] == jobs
+    assert [result.answer for result in results] == [2, None, 13, 13, 12]
+    assert [result.ok for result in results] == [True, False, True, True, True]
+
+
+def test_default_chunksize():
+    assert default_chunksize(3, 4) == 1
+    assert default_chunksize(1000, 4) == 62
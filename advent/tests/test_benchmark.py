@@ -0,0 +1,67 @@
+from pathlib import Path
+import pytest
+from advent.benchmark import BenchmarkResult, run_benchmarks, percentile, find_regressions, save_results, \
+    load_results, replicated_input, implementations
+from advent.common import TEST_INPUTS_FOLDER
+
+
+def make_result(implementation: str, median_ns: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        day=6, part=1, implementation=implementation, size=1, median_ns=median_ns, p95_ns=median_ns,
+        min_ns=int(median_ns), repeats=1
+    )
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile([7], 0.95) == 7
+
+
+def test_replicated_input(tmp_path):
+    file_path = replicated_input(4, 3, tmp_path)
+    original_lines = replicated_input(4, 1, tmp_path).read_text().splitlines()
+    assert file_path.read_text().splitlines() == original_lines * 3
+    assert replicated_input(8, 3, tmp_path) is None
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(days=[6], sizes=[1], repeats=2, warmup=0)
+    assert {(result.part, result.implementation) for result in results} == {
+        (part, implementation) for part in (1, 2) for implementation in ("default", "queue", "set", "combinations")
+    }
+    for result in results:
+        assert result.repeats == 2
+        assert 0 < result.min_ns <= result.median_ns <= result.p95_ns
+
+
+def test_alternatives_are_collected():
+    collected = implementations()
+    assert {"per-line", "single-pass", "map-reduce"} <= set(collected[(2, 2)])
+    assert {"per-letter", "single-pass"} <= set(collected[(3, 1)])
+    assert {"per-line", "reverse-trace", "single-pass"} <= set(collected[(5, 2)])
+
+
+@pytest.mark.parametrize("day, part", sorted(key for key, solvers in implementations().items() if len(solvers) > 1))
+def test_alternatives_agree(day, part):
+    file_path = Path(TEST_INPUTS_FOLDER, f"{day}.txt")
+    if not file_path.exists():
+        file_path = Path(TEST_INPUTS_FOLDER, f"{day}_1.txt")
+    answers = {name: solver(file_path) for name, solver in implementations()[(day, part)].items()}
+    assert set(answers.values()) == {answers["default"]}, answers
+
+
+def test_find_regressions():
+    baseline = [make_result("default", 100), make_result("set", 100)]
+    results = [make_result("default", 105), make_result("set", 150), make_result("combinations", 1000)]
+    regressions = find_regressions(results, baseline, threshold=0.1)
+    assert [regression.result.implementation for regression in regressions] == ["set"]
+    assert regressions[0].slowdown == 1.5
+
+
+def test_save_and_load_results(tmp_path):
+    results = [make_result("default", 100), make_result("set", 250.5)]
+    file_path = Path(tmp_path, "results.json")
+    save_results(results, file_path)
+    assert load_results(file_path) == results
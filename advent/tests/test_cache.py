@@ -0,0 +1,106 @@
+import os
+import pytest
+from array import array
+from pathlib import Path
+from advent import cache
+from advent.common import TEST_INPUTS_FOLDER
+from advent.solutions.seven import parse_commands_to_file_tree, encode_file_tree, find_small_directories
+from advent.solutions.eight import parse_rows_and_cols, count_visible
+
+
+SEVEN_TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, "7.txt")
+EIGHT_TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, "8.txt")
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    directory = Path(tmp_path, "cache")
+    cache.configure(directory)
+    yield directory
+    cache.configure(None)
+
+
+def test_dump_and_load_arrays(tmp_path):
+    arrays = {"numbers": array("q", [1, -2, 3]), "empty": array("i"), "raw": b"abc\ndef"}
+    file_path = Path(tmp_path, "entry.bin")
+    cache.dump_arrays(arrays, file_path)
+    assert cache.load_arrays(file_path) == arrays
+
+
+def test_load_arrays_rejects_other_files(tmp_path):
+    file_path = Path(tmp_path, "entry.bin")
+    file_path.write_bytes(b"not a cache entry")
+    with pytest.raises(ValueError):
+        cache.load_arrays(file_path)
+
+
+@pytest.mark.parametrize("length", [len(cache.MAGIC), len(cache.MAGIC) + 2, len(cache.MAGIC) + 6, -1])
+def test_load_arrays_rejects_truncated_entries(length, tmp_path):
+    file_path = Path(tmp_path, "entry.bin")
+    cache.dump_arrays({"numbers": array("q", [1, -2, 3]), "raw": b"abc"}, file_path)
+    file_path.write_bytes(file_path.read_bytes()[:length])
+    with pytest.raises(ValueError):
+        cache.load_arrays(file_path)
+
+
+def test_cached_parser_recovers_from_truncated_entry(cache_dir, tmp_path):
+    @cache.cached_parser("test.text.v1", encode=lambda text: {"text": text.encode()},
+                         decode=lambda arrays: arrays["text"].decode())
+    def parse(file_path):
+        return Path(file_path).read_text()
+
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_text("abc")
+    assert parse(file_path) == "abc"
+    (entry_path,) = cache.cache_entries()
+    entry_path.write_bytes(cache.MAGIC)
+    assert parse(file_path) == "abc"
+    assert entry_path.read_bytes() != cache.MAGIC
+
+
+def test_cached_parser(cache_dir, tmp_path):
+    calls = []
+
+    @cache.cached_parser("test.lengths.v1", encode=lambda lengths: {"lengths": array("q", lengths)},
+                         decode=lambda arrays: list(arrays["lengths"]))
+    def parse_line_lengths(file_path):
+        calls.append(file_path)
+        return [len(line) for line in Path(file_path).read_text().splitlines()]
+
+    first_path = Path(tmp_path, "first.txt")
+    second_path = Path(tmp_path, "second.txt")
+    first_path.write_text("a\nbb\nccc\n")
+    second_path.write_text("a\nbb\nccc\n")
+    assert parse_line_lengths(first_path) == [1, 2, 3]
+    assert parse_line_lengths(first_path) == [1, 2, 3]
+    # same contents in a different file are found in the cache too
+    assert parse_line_lengths(second_path) == [1, 2, 3]
+    assert calls == [first_path]
+    second_path.write_text("dddd\n")
+    assert parse_line_lengths(second_path) == [4]
+    assert len(cache.cache_entries()) == 2
+
+
+def test_eviction(cache_dir, tmp_path):
+    entry_paths = []
+    for i in range(4):
+        entry_path = Path(cache_dir, f"entry{i}.bin")
+        cache.dump_arrays({"values": array("q", range(100))}, entry_path)
+        os.utime(entry_path, ns=(i * 10 ** 9, i * 10 ** 9))
+        entry_paths.append(entry_path)
+    entry_size = entry_paths[0].stat().st_size
+    cache.evict(cache_dir, 2 * entry_size)
+    assert cache.cache_entries() == entry_paths[2:]
+
+
+def test_cached_file_tree(cache_dir):
+    uncached_tree = parse_commands_to_file_tree(SEVEN_TEST_INPUT_FILE_PATH)
+    cached_tree = parse_commands_to_file_tree(SEVEN_TEST_INPUT_FILE_PATH)
+    assert encode_file_tree(cached_tree) == encode_file_tree(uncached_tree)
+    assert find_small_directories(SEVEN_TEST_INPUT_FILE_PATH) == 95437
+
+
+def test_cached_rows_and_cols(cache_dir):
+    assert parse_rows_and_cols(EIGHT_TEST_INPUT_FILE_PATH) == parse_rows_and_cols.uncached(EIGHT_TEST_INPUT_FILE_PATH)
+    assert parse_rows_and_cols(EIGHT_TEST_INPUT_FILE_PATH) == parse_rows_and_cols.uncached(EIGHT_TEST_INPUT_FILE_PATH)
+    assert count_visible(EIGHT_TEST_INPUT_FILE_PATH) == 21
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import threading
+import pytest
+from pathlib import Path
+from advent import common
+from advent.common import TEST_INPUTS_FOLDER, MappedInput, async_yield_lines, async_yield_text, yield_lines, read_file
+
+
+TEST_INPUT_FILE_NAME = "1.txt"
+TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, TEST_INPUT_FILE_NAME)
+
+
+@pytest.mark.parametrize("contents", [
+    b"",
+    b"\n\n",
+    b"1000\n2000\n\n3000\n",
+    b"1000\n2000\n\n3000",
+    b"1000\r\n2000\r\n\r\n3000\r\n"
+])
+def test_yield_lines_matches_text_mode(tmp_path, contents):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(contents)
+    with open(file_path, "r") as reader:
+        expected_lines = list(reader)
+    assert list(yield_lines(file_path)) == expected_lines
+
+
+def test_read_file_matches_text_mode(tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(b"A Y\r\nB X\r\nC Z")
+    assert read_file(file_path) == "A Y\nB X\nC Z"
+
+
+def test_mapped_input_lines():
+    raw_lines = TEST_INPUT_FILE_PATH.read_bytes().splitlines()
+    with MappedInput(TEST_INPUT_FILE_PATH) as mapped:
+        assert len(mapped) == len(raw_lines)
+        assert [bytes(line) for line in mapped.lines()] == raw_lines
+        assert bytes(mapped.line(0)) == raw_lines[0]
+        assert bytes(mapped.line(len(mapped) - 1, keepends=True)) == raw_lines[-1] + b"\n"
+
+
+def test_mapped_input_line_offsets_without_trailing_newline(tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(b"ab\n\ncde")
+    with MappedInput(file_path) as mapped:
+        assert list(mapped.line_offsets) == [0, 3, 4, 7]
+        assert bytes(mapped.line(2)) == b"cde"
+
+
+def test_mapped_input_chunks_end_on_line_boundaries():
+    contents = TEST_INPUT_FILE_PATH.read_bytes()
+    with MappedInput(TEST_INPUT_FILE_PATH) as mapped:
+        chunks = list(mapped.chunks(chunk_size=10))
+    assert b"".join(contents[begin:end] for begin, end in chunks) == contents
+    for begin, end in chunks[:-1]:
+        assert contents[end - 1:end] == b"\n"
+
+
+def test_mapped_input_chunks_end_on_separator(tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    contents = b"1\n2\n\n3\n\n4\n5\n6\n\n7"
+    file_path.write_bytes(contents)
+    with MappedInput(file_path) as mapped:
+        chunks = list(mapped.chunks(chunk_size=3, separator=b"\n\n"))
+    assert [contents[begin:end] for begin, end in chunks] == [b"1\n2\n\n", b"3\n\n", b"4\n5\n6\n\n", b"7"]
+
+
+
+@pytest.mark.parametrize("window_size", [1, 4, 1 << 20])
+def test_mapped_input_count_newlines(tmp_path, monkeypatch, window_size):
+    monkeypatch.setattr(common, "CHUNK_SIZE", window_size)
+    file_path = Path(tmp_path, "input.txt")
+    contents = b"1\n2\n\n3\n\n4\n5\n6\n\n7"
+    file_path.write_bytes(contents)
+    with MappedInput(file_path) as mapped:
+        assert mapped.count_newlines() == contents.count(b"\n")
+        for begin, end in [(0, 0), (1, 5), (3, 17), (10, len(contents))]:
+            assert mapped.count_newlines(begin, end) == contents.count(b"\n", begin, end)
+
+
+async def read_stream(generator_function, data: bytes, chunk_size: int) -> list[str]:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return [item async for item in generator_function(reader, chunk_size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+def test_async_yield_lines(chunk_size):
+    data = "ab\r\nčde\n\nf".encode()
+    lines = asyncio.run(read_stream(async_yield_lines, data, chunk_size))
+    assert lines == ["ab\n", "čde\n", "\n", "f"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+def test_async_yield_text(chunk_size):
+    data = "ab\r\nčde\r".encode()
+    assert "".join(asyncio.run(read_stream(async_yield_text, data, chunk_size))) == "ab\nčde\n"
+
+
+def test_non_regular_file(tmp_path):
+    contents = "1000\n2000\r\n\n3000"
+    fifo_path = tmp_path / "fifo"
+    os.mkfifo(fifo_path)
+    for read in (read_file, lambda file_path: "".join(yield_lines(file_path))):
+        writer = threading.Thread(target=fifo_path.write_text, args=(contents,))
+        writer.start()
+        assert read(fifo_path) == "1000\n2000\n\n3000"
+        writer.join()
+    writer = threading.Thread(target=fifo_path.write_text, args=(contents,))
+    writer.start()
+    with MappedInput(fifo_path) as mapped:
+        assert [bytes(line) for line in mapped.lines()] == [b"1000", b"2000", b"", b"3000"]
+        assert len(mapped) == 4
+    writer.join()
@@ -0,0 +1,58 @@
+import pytest
+from pathlib import Path
+from advent.generators import GENERATORS, generate_input
+from advent.runner import find_solutions
+from advent.solutions.five import compute_stack_tops
+from advent.solutions.six import find_first_unique_substring_set
+
+
+SIZES = {
+    1: 50,
+    2: 50,
+    3: 50,
+    4: 50,
+    5: 50,
+    6: 500,
+    7: 50,
+    8: 10,
+    9: 50
+}
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+def test_generated_input_is_reproducible(tmp_path, day):
+    first = generate_input(day, SIZES[day], Path(tmp_path, "first.txt"), seed=3)
+    second = generate_input(day, SIZES[day], Path(tmp_path, "second.txt"), seed=3)
+    other = generate_input(day, SIZES[day], Path(tmp_path, "other.txt"), seed=4)
+    assert first.read_bytes() == second.read_bytes()
+    assert first.read_bytes() != other.read_bytes()
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+def test_generated_input_is_solvable(tmp_path, day):
+    file_path = generate_input(day, SIZES[day], Path(tmp_path, "input.txt"))
+    for part in (1, 2):
+        assert find_solutions()[(day, part)].solver(file_path) is not None
+
+
+def test_generated_rucksacks(tmp_path):
+    file_path = generate_input(3, 10, Path(tmp_path, "input.txt"))
+    rucksacks = file_path.read_text().splitlines()
+    assert len(rucksacks) == 12
+    for rucksack in rucksacks:
+        half = len(rucksack) // 2
+        assert len(set(rucksack[:half]) & set(rucksack[half:])) == 1
+    for i in range(0, len(rucksacks), 3):
+        assert len(set(rucksacks[i]) & set(rucksacks[i + 1]) & set(rucksacks[i + 2])) == 1
+
+
+def test_generated_crates(tmp_path):
+    file_path = generate_input(5, 500, Path(tmp_path, "input.txt"), stack_count=12, stack_height=5)
+    assert len(compute_stack_tops(file_path, True)) == 12
+    assert len(compute_stack_tops(file_path, False)) == 12
+
+
+def test_generated_datastream(tmp_path):
+    file_path = generate_input(6, 1000, Path(tmp_path, "input.txt"))
+    assert len(file_path.read_text()) == 1000
+    assert 1000 - 14 - 8 <= find_first_unique_substring_set(file_path, 14) <= 1000 - 8
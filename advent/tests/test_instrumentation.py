@@ -0,0 +1,88 @@
+from pathlib import Path
+import pytest
+from advent import instrumentation
+from advent.common import TEST_INPUTS_FOLDER
+from advent.registry import MODULES, get_solution
+from time import perf_counter_ns
+from advent.solutions import five, one, two, seven, eight, three_part2
+from advent.solutions.eight import count_visible
+
+
+def test_disabled_functions_are_not_wrapped():
+    assert not instrumentation.is_enabled()
+    assert eight.is_visible.__code__.co_name == "is_visible"
+    assert instrumentation.span("anything") is instrumentation.span("anything else")
+
+
+def test_instrumented_phases():
+    original_is_visible = eight.is_visible
+    original_from_letter = two.GameElement.__dict__["from_letter"].__func__
+    with instrumentation.instrumented():
+        assert eight.is_visible is not original_is_visible
+        assert two.GameElement.from_letter("A") == two.GameElement.ROCK
+        assert count_visible(Path(TEST_INPUTS_FOLDER, "8.txt")) == 21
+        with instrumentation.span("test.block", instrumentation.PARSE):
+            pass
+    assert eight.is_visible is original_is_visible
+    assert two.GameElement.__dict__["from_letter"].__func__ is original_from_letter
+
+    stats = instrumentation.get_stats()
+    assert stats["eight.parse_rows_and_cols"].calls == 1
+    assert stats["eight.parse_rows_and_cols"].kind == instrumentation.PARSE
+    assert stats["eight.is_visible"].calls == 16
+    assert stats["eight.is_visible"].kind == instrumentation.COMPUTE
+    assert stats["two.GameElement.from_letter"].calls == 1
+    assert stats["test.block"].calls == 1
+    assert set(instrumentation.get_totals()) == {instrumentation.PARSE, instrumentation.COMPUTE}
+
+
+def test_recursive_phase_is_timed_once():
+    with instrumentation.instrumented():
+        seven.find_small_directories(Path(TEST_INPUTS_FOLDER, "7.txt"))
+        outer_ns = instrumentation.get_stats()["seven.calculate_all_directory_sizes"].total_ns
+    stats = instrumentation.get_stats()["seven.calculate_all_directory_sizes"]
+    assert stats.calls == 4
+    assert stats.total_ns == outer_ns
+
+
+def test_stats_are_reset():
+    with instrumentation.instrumented():
+        eight.is_visible(5, 1, 1, [[3, 0], [2, 5]], [[3, 2], [0, 5]])
+    assert instrumentation.get_stats()["eight.is_visible"].calls == 1
+    instrumentation.reset()
+    assert instrumentation.get_stats() == {}
+
+
+def test_nested_phases_are_not_counted_twice():
+    with instrumentation.instrumented():
+        start = perf_counter_ns()
+        five.compute_stack_tops_bulk(Path(TEST_INPUTS_FOLDER, "5.txt"), True)
+        wall_ns = perf_counter_ns() - start
+    stats = instrumentation.get_stats()
+    parse_input = stats["five.parse_input"]
+    parse_drawing = stats["five.parse_drawing"]
+    assert parse_drawing.total_ns <= parse_input.total_ns
+    assert parse_input.self_ns == parse_input.total_ns - parse_drawing.total_ns
+    assert sum(instrumentation.get_totals().values()) <= wall_ns
+
+
+def test_generator_phases():
+    with instrumentation.instrumented():
+        assert one.find_top_k_calories(Path(TEST_INPUTS_FOLDER, "1.txt"), 3) == 15113
+        assert three_part2.calculate_priority_sum(Path(TEST_INPUTS_FOLDER, "3.txt")) == 70
+    stats = instrumentation.get_stats()
+    assert stats["one.read_line_batches"].kind == instrumentation.PARSE
+    assert stats["one.read_line_batches"].calls == 1
+    assert stats["one.read_line_batches"].total_ns > 0
+    # the last series, not followed by an empty line
+    assert stats["one._keep_largest"].calls == 1
+    # called through the three module, so it is measured when called from three_part2
+    assert stats["three.get_letter_priority_score"].calls == 2
+
+
+@pytest.mark.parametrize("day, part", sorted(MODULES))
+def test_every_solver_has_parse_phase(day, part):
+    solution = get_solution(day, part)
+    with instrumentation.instrumented():
+        solution.solver(solution.default_input)
+    assert instrumentation.get_totals()[instrumentation.PARSE] > 0
@@ -0,0 +1,42 @@
+from pathlib import Path
+import pytest
+from advent.common import TEST_INPUTS_FOLDER, MappedInput
+from advent.mapreduce import ALL_PARTS, TASKS, solve, split_file
+from advent.registry import get_solution
+
+
+@pytest.mark.parametrize("day, part", sorted(key for key in TASKS if key[1] != ALL_PARTS))
+def test_solve_matches_sequential_solver(day, part):
+    file_path = Path(TEST_INPUTS_FOLDER, f"{day}.txt")
+    expected = get_solution(day, part).solver(file_path)
+    assert solve(day, part, file_path, max_workers=1, chunk_size=8) == expected
+
+
+def test_solve_in_worker_processes(tmp_path):
+    file_path = Path(tmp_path, "3.txt")
+    file_path.write_text("\n".join([Path(TEST_INPUTS_FOLDER, "3.txt").read_text()] * 50))
+    assert solve(3, 2, file_path, max_workers=2, chunk_size=256) == 70 * 50
+    assert solve(1, 2, Path(TEST_INPUTS_FOLDER, "1.txt"), max_workers=2, chunk_size=64) == 15113
+
+
+def test_solve_all_parts(tmp_path):
+    file_path = Path(tmp_path, "2.txt")
+    file_path.write_text("A Y\nB X\nC Z\n" * 100)
+    assert solve(2, ALL_PARTS, file_path, max_workers=2, chunk_size=64) == (1500, 1200)
+    assert solve(3, ALL_PARTS, Path(TEST_INPUTS_FOLDER, "3.txt"), max_workers=2, chunk_size=8) == (157, 70)
+
+
+def test_split_file_keeps_groups_of_lines():
+    file_path = Path(TEST_INPUTS_FOLDER, "3.txt")
+    contents = file_path.read_bytes()
+    with MappedInput(file_path) as mapped:
+        chunks = list(split_file(mapped, TASKS[(3, 2)], chunk_size=8))
+    assert len(chunks) > 1
+    assert b"".join(contents[begin:end] for begin, end in chunks) == contents
+    for begin, end in chunks:
+        assert len(contents[begin:end].splitlines()) % 3 == 0
+
+
+def test_solve_unsupported_day():
+    with pytest.raises(LookupError):
+        solve(7, 1, Path(TEST_INPUTS_FOLDER, "7.txt"))
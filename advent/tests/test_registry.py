@@ -0,0 +1,122 @@
+import asyncio
+import importlib
+import pkgutil
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import advent.solutions
+from advent.common import TEST_INPUTS_FOLDER
+from advent.registry import MODULES, days, get_alternative_solvers, get_async_solver, get_solution, parts
+
+
+def test_modules_match_declared_parts():
+    declared = {}
+    for module_info in pkgutil.iter_modules(advent.solutions.__path__):
+        module_name = f"{advent.solutions.__name__}.{module_info.name}"
+        module = importlib.import_module(module_name)
+        for part in module.PARTS:
+            declared[(module.DAY, part)] = module_name
+    assert declared == MODULES
+
+
+def test_days_and_parts():
+    assert days() == list(range(1, 10))
+    assert parts(2) == [1, 2]
+    assert parts(25) == []
+
+
+def test_get_solution():
+    solution = get_solution(2, 2)
+    assert (solution.day, solution.part) == (2, 2)
+    assert solution.solver.__module__ == "advent.solutions.two_part2"
+    assert solution.default_input.name == "2.txt"
+
+
+def test_get_alternative_solvers():
+    alternatives = get_alternative_solvers()
+    # the single pass over both parts of day 2 lives in the module of part 2, but solves part 1 too
+    assert alternatives[(2, 1)]["single-pass"](Path(TEST_INPUTS_FOLDER, "2.txt")) == 15
+    assert set(alternatives[(2, 2)]) == {"per-line", "single-pass"}
+    assert (7, 1) not in alternatives
+
+
+def test_get_solution_unknown():
+    with pytest.raises(LookupError):
+        get_solution(25, 1)
+
+
+ASYNC_TEST_INPUTS = {
+    1: ["1.txt"],
+    2: ["2.txt"],
+    3: ["3.txt"],
+    4: ["4.txt"],
+    6: ["6_1.txt", "6_5.txt"],
+    9: ["9.txt", "9_1.txt"]
+}
+
+
+async def solve_streams(day: int, part: int, file_paths: list[Path]) -> list:
+    solver = get_async_solver(day, part)
+    readers = []
+    for file_path in file_paths:
+        reader = asyncio.StreamReader()
+        reader.feed_data(file_path.read_bytes())
+        reader.feed_eof()
+        readers.append(reader)
+    return await asyncio.gather(*(solver(reader) for reader in readers))
+
+
+@pytest.mark.parametrize("day", sorted(ASYNC_TEST_INPUTS))
+@pytest.mark.parametrize("part", [1, 2])
+def test_async_solver_matches_solver(day, part):
+    file_paths = [Path(TEST_INPUTS_FOLDER, file_name) for file_name in ASYNC_TEST_INPUTS[day]]
+    expected = [get_solution(day, part).solver(file_path) for file_path in file_paths]
+    assert asyncio.run(solve_streams(day, part, file_paths)) == expected
+
+
+def test_get_async_solver_unknown():
+    with pytest.raises(LookupError):
+        get_async_solver(7, 1)
+    with pytest.raises(LookupError):
+        get_async_solver(25, 1)
+
+
+def test_runner_imports_only_requested_day():
+    # run in a fresh interpreter, as this one has imported everything already
+    code = (
+        "import sys\n"
+        "from advent.runner import main\n"
+        "main(['1', '1', '--no-memory'])\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    assert output[0].startswith("day 1 part 1: ")
+    modules = set(output[-1].split())
+    assert {name for name in modules if name.startswith("advent.solutions.")} == {"advent.solutions.one"}
+    assert not modules & {"pkgutil", "tracemalloc", "advent.cache", "hashlib", "json", "queue", "asyncio"}
+
+
+def measure_import_ns(imports: str, runs: int = 3) -> int:
+    """
+    Wall time of running the given import statements in a fresh interpreter, the best of a few runs.
+    """
+    code = f"from time import perf_counter_ns\nstart = perf_counter_ns()\n{imports}\nprint(perf_counter_ns() - start)\n"
+    return min(
+        int(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+        for _ in range(runs)
+    )
+
+
+def test_runner_startup_cost():
+    day_1_ns = measure_import_ns("from advent import registry, runner\nregistry.get_solution(1, 1)")
+    everything_ns = measure_import_ns(
+        "from advent import registry, runner\n"
+        "import advent.batch, advent.benchmark, advent.cache, advent.mapreduce, asyncio\n"
+        "for day, part in registry.MODULES:\n"
+        "    registry.get_solution(day, part)"
+    )
+    # solving one day has to cost well under what importing all the solutions and tools does
+    assert day_1_ns < everything_ns / 2
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from pathlib import Path
+from advent.common import TEST_INPUTS_FOLDER
+from advent.runner import find_solutions, run, main
+
+
+TEST_INPUT_FILE_NAME = "4.txt"
+TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, TEST_INPUT_FILE_NAME)
+
+
+def test_find_solutions():
+    solutions = find_solutions()
+    assert set(solutions) == {(day, part) for day in range(1, 10) for part in (1, 2)}
+
+
+def test_run():
+    solution = find_solutions()[(4, 2)]
+    result = run(solution, TEST_INPUT_FILE_PATH)
+    assert result.answer == 4
+    assert result.solve_ns > 0 and result.parse_ns > 0 and result.compute_ns >= 0
+    assert result.parse_ns + result.compute_ns == result.solve_ns
+    assert result.peak_bytes > 0
+    assert result.phases is None
+
+
+def test_run_without_memory():
+    solution = find_solutions()[(4, 1)]
+    result = run(solution, TEST_INPUT_FILE_PATH, measure_memory=False)
+    assert result.answer == 2
+    assert result.peak_bytes is None
+
+
+def test_run_phases():
+    solution = find_solutions()[(5, 2)]
+    result = run(solution, Path(TEST_INPUTS_FOLDER, "5.txt"), measure_memory=False, measure_phases=True)
+    assert result.answer == "MCD"
+    assert "five.parse_input" in result.phases
+
+
+def test_main(capsys):
+    assert main(["4", "--input", str(TEST_INPUT_FILE_PATH), "--no-memory"]) == 0
+    output_lines = capsys.readouterr().out.splitlines()
+    assert output_lines[0].startswith("day 4 part 1: 2 ")
+    assert output_lines[1].startswith("day 4 part 2: 4 ")
+
+
+def test_main_unknown_day():
+    assert main(["25"]) == 1
+
+
+def test_main_pipe():
+    process = subprocess.run(
+        [sys.executable, "-m", "advent", "1", "1", "--input", "/dev/stdin"],
+        input=b"1000\n2000\n\n3000\n",
+        capture_output=True,
+        check=True
+    )
+    assert process.stdout.decode().startswith("day 1 part 1: 3000 ")